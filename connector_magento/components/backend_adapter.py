@@ -2,15 +2,23 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
 import logging
+import math
+import random
 import socket
+import threading
+import time
 import xmlrpc.client
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from urllib.parse import quote_plus
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from odoo.addons.component.core import AbstractComponent
-from odoo.addons.connector.exception import NetworkRetryableError
+from odoo.addons.connector.exception import IDMissingInBackend, NetworkRetryableError
 from odoo.addons.queue_job.exception import RetryableJobError
 
 _logger = logging.getLogger(__name__)
@@ -23,6 +31,145 @@ except ImportError:
 
 MAGENTO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_PAGE_SIZE = 100
+
+METRICS_SAMPLE_SIZE = 1000  # latencies kept per endpoint between 2 flushes
+METRICS_FLUSH_INTERVAL = 60  # seconds
+
+# HTTP sessions are kept per thread (each worker thread of the jobrunner
+# has its own) and per backend, so the TCP/TLS connections are reused
+# from one sync session to the next.
+_sessions = threading.local()
+
+
+def get_session(key, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+    """Return the HTTP session of the current thread for ``key``
+
+    The session is created on the first call, with a pool of keep-alive
+    connections, see :meth:`Magento2Client._new_session`.
+    """
+    key = (key, pool_size, max_retries)
+    sessions = getattr(_sessions, "sessions", None)
+    if sessions is None:
+        sessions = _sessions.sessions = {}
+    session = sessions.get(key)
+    if session is None:
+        session = sessions[key] = Magento2Client._new_session(pool_size, max_retries)
+    return session
+
+
+def resource_path_template(resource_path):
+    """Return the template of a resource path, used to group the metrics
+
+    The segments containing a digit or an escaped character (ids, SKUs,
+    increment ids) are replaced by ``{id}``, so
+    ``products/MH09-L-Blue/stockItems/190`` gives
+    ``products/{id}/stockItems/{id}``.
+    """
+    return "/".join(
+        "{id}" if any(char.isdigit() or char == "%" for char in segment) else segment
+        for segment in resource_path.split("/")
+    )
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of a sorted list of values"""
+    if not values:
+        return 0.0
+    rank = max(int(math.ceil(percent / 100.0 * len(values))), 1)
+    return values[rank - 1]
+
+
+class CallMetrics(object):
+    """Counters and latencies of the calls to Magento, per endpoint
+
+    The metrics are kept in memory by each process, per ``(backend id,
+    resource path template, HTTP method)``, until they are collected with
+    :meth:`pop`. The percentiles are computed on a random sample of the
+    latencies of each endpoint.
+
+    The lookups of the reference records cached during the imports are
+    counted as well, per ``(backend id, model)``, see :meth:`pop_lookups`.
+    """
+
+    def __init__(
+        self, sample_size=METRICS_SAMPLE_SIZE, flush_interval=METRICS_FLUSH_INTERVAL
+    ):
+        self.sample_size = sample_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._lookups = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, key, duration, error=False, size=0):
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "bytes": 0,
+                    "max": 0.0,
+                    "latencies": [],
+                }
+            metric["count"] += 1
+            metric["errors"] += int(bool(error))
+            metric["bytes"] += size
+            metric["max"] = max(metric["max"], duration)
+            latencies = metric["latencies"]
+            if len(latencies) < self.sample_size:
+                latencies.append(duration)
+            else:
+                # reservoir sampling: each call has the same probability
+                # to be in the sample
+                index = random.randrange(metric["count"])
+                if index < self.sample_size:
+                    latencies[index] = duration
+
+    def record_lookup(self, key, miss=False):
+        """Count a lookup of a cached reference record, or a miss of the
+        cache when ``miss`` is set"""
+        with self._lock:
+            lookup = self._lookups.setdefault(key, {"count": 0, "misses": 0})
+            lookup["misses" if miss else "count"] += 1
+
+    def flush_due(self):
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def pop(self):
+        """Return the metrics recorded since the last call and reset them
+
+        :return: dict ``{key: metric}`` where the metric has the keys
+                 ``count``, ``errors``, ``bytes``, ``p50``, ``p95``,
+                 ``p99`` and ``max`` (latencies in seconds)
+        """
+        with self._lock:
+            metrics, self._metrics = self._metrics, {}
+            self._last_flush = time.monotonic()
+        for metric in metrics.values():
+            latencies = sorted(metric.pop("latencies"))
+            for percent in (50, 95, 99):
+                metric["p%d" % percent] = percentile(latencies, percent)
+        return metrics
+
+    def pop_lookups(self):
+        """Return the lookups recorded since the last call and reset them
+
+        :return: dict ``{key: lookup}`` where the lookup has the keys
+                 ``count`` and ``hits``
+        """
+        with self._lock:
+            lookups, self._lookups = self._lookups, {}
+        for lookup in lookups.values():
+            lookup["hits"] = max(lookup["count"] - lookup.pop("misses"), 0)
+        return lookups
+
+
+api_metrics = CallMetrics()
+
 
 class MagentoLocation(object):
     def __init__(
@@ -47,6 +194,13 @@ class MagentoLocation(object):
         self.auth_basic_username = None
         self.auth_basic_password = None
 
+        self.pool_size = DEFAULT_POOL_SIZE
+        self.keep_alive = True
+        self.max_retries = DEFAULT_MAX_RETRIES
+
+        self.backend_id = None
+        self.collect_metrics = False
+
     @property
     def location(self):
         location = self._location
@@ -61,15 +215,92 @@ class MagentoLocation(object):
 
 
 class Magento2Client(object):
-    def __init__(self, url, token, verify_ssl=True, use_custom_api_path=False):
+    def __init__(
+        self,
+        url,
+        token,
+        verify_ssl=True,
+        use_custom_api_path=False,
+        pool_size=DEFAULT_POOL_SIZE,
+        keep_alive=True,
+        max_retries=DEFAULT_MAX_RETRIES,
+    ):
         if not use_custom_api_path:
             url += "/" if not url.endswith("/") else ""
             url += "index.php/rest/V1"
         self._url = url
         self._token = token
         self._verify_ssl = verify_ssl
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._max_retries = max_retries
 
-    def call(self, resource_path, arguments, http_method=None, storeview=None):
+    @staticmethod
+    def _new_session(pool_size, max_retries):
+        """Build a session with a pool of keep-alive connections
+
+        The retries apply to the connection errors and to the errors
+        raised when the server closed a connection kept in the pool
+        (read errors on idempotent methods only, a POST is never sent
+        twice).
+        """
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=0,
+            backoff_factor=0.1,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self):
+        """Return the session of the current thread for this client
+
+        Sessions are shared between the clients of the same thread using
+        the same Magento location, so the connections survive the end of
+        a sync session.
+        """
+        return get_session(
+            self._url, pool_size=self._pool_size, max_retries=self._max_retries
+        )
+
+    def connection_stats(self):
+        """Return the usage counters of the connection pools
+
+        ``requests`` is the number of requests sent through the pools,
+        ``connections`` the number of connections opened and ``reused``
+        the number of requests which have been sent on an already opened
+        connection.
+        """
+        requests_count = connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools[pool_key]
+                requests_count += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "requests": requests_count,
+            "connections": connections,
+            "reused": max(requests_count - connections, 0),
+        }
+
+    def call(
+        self, resource_path, arguments, http_method=None, storeview=None, stats=None
+    ):
+        """Call the REST API
+
+        :param stats: optional dict receiving the size of the response
+                      in ``bytes``
+        """
         if resource_path is None:
             _logger.exception("Magento2 REST API called without resource path")
             raise NotImplementedError
@@ -79,14 +310,17 @@ class Magento2Client(object):
             url = url.replace("/rest/V1/", "/rest/%s/V1/" % storeview)
         if http_method is None:
             http_method = "get"
-        function = getattr(requests, http_method)
         headers = {"Authorization": "Bearer %s" % self._token}
-        kwargs = {"headers": headers}
+        if not self._keep_alive:
+            headers["Connection"] = "close"
+        kwargs = {"headers": headers, "verify": self._verify_ssl}
         if http_method == "get":
             kwargs["params"] = arguments
         elif arguments is not None:
             kwargs["json"] = arguments
-        res = function(url, **kwargs)
+        res = self.session.request(http_method, url, **kwargs)
+        if stats is not None:
+            stats["bytes"] = len(res.content)
         if res.status_code == 400 and res._content:
             raise requests.HTTPError(
                 url, res.status_code, res._content, headers, __name__
@@ -121,18 +355,44 @@ class MagentoAPI(object):
                     self._location.token,
                     self._location.verify_ssl,
                     use_custom_api_path=self._location.use_custom_api_path,
+                    pool_size=self._location.pool_size,
+                    keep_alive=self._location.keep_alive,
+                    max_retries=self._location.max_retries,
                 )
             self._api = api
         return self._api
 
-    def api_call(self, method, arguments, http_method=None, storeview=None):
+    def api_call(self, method, arguments, http_method=None, storeview=None, stats=None):
         """Adjust available arguments per API"""
         if isinstance(self.api, magentolib.API):
             return self.api.call(method, arguments)
         return self.api.call(
-            method, arguments, http_method=http_method, storeview=storeview
+            method, arguments, http_method=http_method, storeview=storeview, stats=stats
         )
 
+    def _record_metrics(self, method, http_method, start, stats, error=False):
+        """Record the metrics of a call in :data:`api_metrics`
+
+        :return: duration of the call in seconds
+        """
+        duration = time.monotonic() - start
+        if self._location.collect_metrics:
+            if self._location.version == "1.7":
+                http_method = "post"  # XML-RPC
+            key = (
+                self._location.backend_id,
+                resource_path_template(method),
+                (http_method or "get").upper(),
+            )
+            api_metrics.record(key, duration, error=error, size=stats.get("bytes", 0))
+        return duration
+
+    def connection_stats(self):
+        """Return the connection reuse counters of the Magento 2 client"""
+        if self._api is None or not hasattr(self._api, "connection_stats"):
+            return {}
+        return self._api.connection_stats()
+
     def __enter__(self):
         # we do nothing, api is lazy
         return self
@@ -140,6 +400,8 @@ class MagentoAPI(object):
     def __exit__(self, exc_type, exc_value, traceback):
         if self._api is not None and hasattr(self._api, "__exit__"):
             self._api.__exit__(exc_type, exc_value, traceback)
+        if self._api is not None and _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug("Magento connection pool: %s", self.connection_stats())
 
     def call(self, method, arguments, http_method=None, storeview=None):
         try:
@@ -149,21 +411,28 @@ class MagentoAPI(object):
             if isinstance(arguments, list):
                 while arguments and arguments[-1] is None:
                     arguments.pop()
-            start = datetime.now()
+            start = time.monotonic()
+            stats = {}
             try:
                 result = self.api_call(
-                    method, arguments, http_method=http_method, storeview=storeview
+                    method,
+                    arguments,
+                    http_method=http_method,
+                    storeview=storeview,
+                    stats=stats,
                 )
             except Exception:
+                self._record_metrics(method, http_method, start, stats, error=True)
                 _logger.error("api.call('%s', %s) failed", method, arguments)
                 raise
             else:
+                duration = self._record_metrics(method, http_method, start, stats)
                 _logger.debug(
-                    "api.call('%s', %s) returned %s in %s seconds",
+                    "api.call('%s', %s) returned %s in %.3f seconds",
                     method,
                     arguments,
                     result,
-                    (datetime.now() - start).seconds,
+                    duration,
                 )
             # Uncomment to record requests/responses in ``recorder``
             # record(method, arguments, result)
@@ -249,6 +518,11 @@ class GenericAdapter(AbstractComponent):
     _magento2_model = None
     _magento2_search = None
     _magento2_key = None
+    # ascending unique field used by the cursor searches, the key by default
+    _magento2_cursor_key = None
+    # name of the cursor field in the search criteria, when it differs
+    # from its name in the records
+    _magento2_cursor_field = None
     _admin_path = None
     _admin2_path = None
 
@@ -261,6 +535,10 @@ class GenericAdapter(AbstractComponent):
 
         Presumably, filter_groups are joined with AND, while filters in the
         same group are joined with OR (not supported here).
+
+        The special keys ``pageSize`` and ``current_page`` set the paging
+        and ``sortOrders``, a list of ``(field, direction)`` tuples, the
+        sort order of the results.
         """
         def get_page_searchCriteria(filters):
             filters = filters or {}
@@ -271,6 +549,12 @@ class GenericAdapter(AbstractComponent):
             if "current_page" in filters:
                 current_page = filters.pop("current_page", False)
                 page_criteria["searchCriteria[current_page]"] = current_page
+            sort_expr = "searchCriteria[sortOrders][%s][%s]"
+            for index, (field, direction) in enumerate(
+                filters.pop("sortOrders", None) or []
+            ):
+                page_criteria[sort_expr % (index, "field")] = field
+                page_criteria[sort_expr % (index, "direction")] = direction
             return page_criteria
         filters = filters or {}
         res = {}
@@ -320,7 +604,7 @@ class GenericAdapter(AbstractComponent):
             }
         return res
     
-    def search(self, filters=None):
+    def search(self, filters=None, cursor=False, page_size=DEFAULT_PAGE_SIZE):
         """Search records according to some criterias
         and returns a list of unique identifiers
 
@@ -332,26 +616,188 @@ class GenericAdapter(AbstractComponent):
         /search APIs return a dictionary with a top level 'items' key.
         Repository APIs return a list of items.
 
+        With ``cursor``, the records are walked by pages of ``page_size``
+        records, see :meth:`_search_cursor_pages` (Magento 2.x only).
+
         :rtype: list
         """
         if self.collection.version == "1.7":
             return self._call(
                 "%s.search" % self._magento_model, [filters] if filters else [{}]
             )
+        if cursor:
+            return [
+                external_id
+                for page in self._search_cursor_pages(filters, page_size)
+                for external_id in page
+            ]
         key = self._magento2_key or "id"
         params = {}
         if self._magento2_search:
             params["fields"] = "items[%s]" % key
             params.update(self.get_searchCriteria(filters))
         else:
-            params["fields"] = key
             if filters:
                 raise NotImplementedError
-        res = self._call(self._magento2_search or self._magento2_model, params)
+            # the whole list is read, and kept for the reads of the session
+            res = list(self._snapshot_records(self._magento2_model).values())
+            return [item[key] for item in res if item[key] != 0]
+        res = self._call(self._magento2_search, params)
         if "items" in res:
             res = res["items"] or []
         return [item[key] for item in res if item[key] != 0]
 
+    def _page_items(self, result, read=False):
+        """Extract the ids, or the records when ``read`` is True, from
+        the result of a Magento 2.x search"""
+        items = result.get("items") or []
+        if read:
+            return items
+        key = self._magento2_key or "id"
+        return [item[key] for item in items if item[key] != 0]
+
+    def _search_cursor_pages(
+        self, filters=None, page_size=DEFAULT_PAGE_SIZE, read=False, attributes=None
+    ):
+        """Walk the records of a Magento 2.x search with a cursor
+
+        The records are sorted on the cursor key (``_magento2_cursor_key``,
+        or the key of the model, searched as ``_magento2_cursor_field`` if
+        set) and each page is filtered on the records
+        with a key greater than the last key of the previous page, instead
+        of using an offset. Every page costs the same on the Magento side
+        and the records created or deleted during the walk do not shift the
+        following pages, so no record is skipped or returned twice.
+
+        Yield the list of ids of each page, or the list of records when
+        ``read`` is True, restricted to their ``attributes`` if any.
+        """
+        if self.collection.version == "1.7" or not self._magento2_search:
+            raise NotImplementedError
+        filters = filters or {}
+        key = self._magento2_key or "id"
+        cursor_key = self._magento2_cursor_key or key
+        cursor_field = self._magento2_cursor_field or cursor_key
+        fields = None
+        if not read:
+            fields = self._fields_param(sorted({key, cursor_key}), items=True)
+        elif attributes:
+            # the cursor key is needed to fetch the next page
+            attributes = list(attributes)
+            if cursor_key not in attributes:
+                attributes.append(cursor_key)
+            fields = self._fields_param(attributes, items=True)
+        last_key = None
+        while True:
+            page_filters = dict(filters)
+            if last_key is not None:
+                page_filters[cursor_field] = dict(
+                    filters.get(cursor_field) or {}, gt=last_key
+                )
+            params = self.get_searchCriteria(
+                dict(
+                    page_filters,
+                    pageSize=page_size,
+                    sortOrders=[(cursor_field, "ASC")],
+                )
+            )
+            if fields:
+                params["fields"] = fields
+            result = self._call(self._magento2_search, params)
+            items = result.get("items") or []
+            if not items:
+                return
+            yield self._page_items(result, read=read)
+            if len(items) < page_size:
+                return
+            last_key = items[-1][cursor_key]
+
+    def search_pages(
+        self,
+        filters=None,
+        page_size=DEFAULT_PAGE_SIZE,
+        read=False,
+        max_workers=1,
+        cursor=False,
+    ):
+        """Search records page by page (Magento 2.x only)
+
+        Yield the list of ids of each page, or the list of records
+        when ``read`` is True.
+
+        The number of pages is known from the ``total_count`` of the
+        first page, the following pages are then fetched concurrently by
+        up to ``max_workers`` threads, no more than ``max_workers`` pages
+        ahead of the page yielded. They are still yielded in order.
+        The threads only send the HTTP requests, the pages are processed
+        in the calling thread.
+
+        With ``cursor``, the pages are fetched one after the other with
+        :meth:`_search_cursor_pages` and ``max_workers`` is ignored.
+        """
+        if cursor:
+            yield from self._search_cursor_pages(
+                filters, page_size=page_size, read=read
+            )
+            return
+        if self.collection.version == "1.7" or not self._magento2_search:
+            raise NotImplementedError
+        filters = filters or {}
+        key = self._magento2_key or "id"
+        fields = None if read else "items[%s],total_count" % key
+
+        def page_params(page):
+            params = self.get_searchCriteria(
+                dict(filters, pageSize=page_size, current_page=page)
+            )
+            if fields:
+                params["fields"] = fields
+            return params
+
+        first_page = self._call(self._magento2_search, page_params(1))
+        yield self._page_items(first_page, read=read)
+        page_count = math.ceil((first_page.get("total_count") or 0) / page_size)
+        if page_count <= 1:
+            return
+        params_list = [page_params(page) for page in range(2, page_count + 1)]
+        if max_workers <= 1:
+            for params in params_list:
+                result = self._call(self._magento2_search, params)
+                yield self._page_items(result, read=read)
+            return
+        magento_api = self.work.magento_api
+        # make sure the client is created before it is shared by the threads
+        magento_api.api  # noqa: B018
+
+        def fetch(params):
+            return magento_api.call(self._magento2_search, params)
+
+        workers = min(max_workers, len(params_list))
+        params_iter = iter(params_list)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # at most ``workers`` pages are fetched ahead of the page
+            # processed by the caller, so they are not all kept in memory
+            futures = deque(
+                executor.submit(fetch, params)
+                for params in islice(params_iter, workers)
+            )
+            while futures:
+                result = futures.popleft().result()
+                params = next(params_iter, None)
+                if params is not None:
+                    futures.append(executor.submit(fetch, params))
+                yield self._page_items(result, read=read)
+
+    @staticmethod
+    def _fields_param(attributes, items=False):
+        """Return the Magento 2.x ``fields`` parameter which restricts the
+        response to the ``attributes`` of the record, or of the records
+        of a search when ``items`` is True"""
+        fields = ",".join(attributes)
+        if items:
+            return "items[%s]" % fields
+        return fields
+
     @staticmethod
     def escape(term):
         if isinstance(term, str):
@@ -361,6 +807,9 @@ class GenericAdapter(AbstractComponent):
     def read(self, external_id, attributes=None, storeview=None):
         """Returns the information of a record
 
+        On Magento 2.x, ``attributes`` are passed in the ``fields``
+        parameter, so only these keys of the record are returned.
+
         :rtype: dict
         """
         if self.collection.version == "1.7":
@@ -379,29 +828,114 @@ class GenericAdapter(AbstractComponent):
                 "%s.info" % self._magento_model, arguments, storeview=storeview
             )
 
-        if attributes:
-            raise NotImplementedError
         if self._magento2_key:
-            return self._call(
-                "{}/{}".format(self._magento2_model, self.escape(external_id)),
-                attributes,
-                storeview=storeview,
-            )
-        res = self._call(self._magento2_model, None)
-        return next(record for record in res if record["id"] == external_id)
+            resource, params = self._read_request(external_id, attributes)
+            return self._read_result(self._call(resource, params, storeview=storeview))
+        record = self._read_snapshot(self._magento2_model, external_id)
+        if attributes:
+            record = {key: record[key] for key in attributes if key in record}
+        return record
 
-    def search_read(self, filters=None):
+    def _read_request(self, external_id, attributes=None):
+        """Return the resource and the parameters of the Magento 2.x request
+        reading a record, see :meth:`read`"""
+        params = None
+        if attributes:
+            params = {"fields": self._fields_param(attributes)}
+        return "{}/{}".format(self._magento2_model, self.escape(external_id)), params
+
+    def _read_result(self, record):
+        """Adapt a record read on Magento 2.x, see :meth:`read`"""
+        return record
+
+    def _snapshot_records(self, resource):
+        """Return the records of a Magento 2.x resource listing all its
+        records, by id
+
+        Used for the resources without API to read a single record, such
+        as the websites, store groups and storeviews. The list is fetched
+        once per sync session and kept in the ``magento_metadata_snapshot``
+        of the work context, for the searches and the reads.
+        """
+        snapshot = getattr(self.work, "magento_metadata_snapshot", None)
+        if snapshot is None:
+            snapshot = {}
+        if resource not in snapshot:
+            snapshot[resource] = {
+                record["id"]: record for record in self._call(resource, None)
+            }
+        return snapshot[resource]
+
+    def _read_snapshot(self, resource, external_id):
+        """Return a record of a Magento 2.x resource listing all its records,
+        see :meth:`_snapshot_records`
+        """
+        records = self._snapshot_records(resource)
+        if external_id not in records:
+            raise IDMissingInBackend
+        # the caller may alter the record
+        return dict(records[external_id])
+
+    def search_read(
+        self, filters=None, cursor=False, page_size=DEFAULT_PAGE_SIZE, attributes=None
+    ):
         """Search records according to some criterias
-        and returns their information"""
+        and returns their information
+
+        In the case of Magento 2.x, the records are extracted from the
+        top level 'items' key of the /search APIs, so a list of records
+        is returned as for Magento 1.x.
+
+        With ``cursor``, the records are walked by pages of ``page_size``
+        records, see :meth:`_search_cursor_pages` (Magento 2.x only).
+
+        On Magento 2.x, only the ``attributes`` of the records are
+        returned when they are given.
+
+        :rtype: list
+        """
         if self.collection.version == "1.7":
             return self._call("%s.list" % self._magento_model, [filters])
+        if cursor:
+            return [
+                record
+                for page in self._search_cursor_pages(
+                    filters, page_size, read=True, attributes=attributes
+                )
+                for record in page
+            ]
         params = {}
         if self._magento2_search:
             params.update(self.get_searchCriteria(filters))
+            if attributes:
+                params["fields"] = self._fields_param(attributes, items=True)
         else:
             if filters:
                 raise NotImplementedError
-        return self._call(self._magento2_search or self._magento2_model, params)
+            if attributes:
+                params["fields"] = self._fields_param(attributes)
+        res = self._call(self._magento2_search or self._magento2_model, params)
+        if isinstance(res, dict) and "items" in res:
+            res = res["items"] or []
+        return res
+
+    def read_updated_dates(self, external_ids):
+        """Return the update date of several records, by external id
+
+        The dates are read with a single search (Magento 2.x only). The
+        records which do not exist on Magento are missing from the result.
+
+        :rtype: dict
+        """
+        if self.collection.version == "1.7" or not self._magento2_search:
+            raise NotImplementedError
+        key = self._magento2_key or "id"
+        external_ids = [str(external_id) for external_id in external_ids]
+        records = self.search_read(
+            filters={key: {"in": external_ids}, "pageSize": len(external_ids)},
+            attributes=[key, "updated_at"],
+        )
+        return {str(record[key]): record.get("updated_at") for record in records}
 
     def create(self, data):
         """Create a record on the external system"""
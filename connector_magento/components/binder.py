@@ -2,6 +2,8 @@
 # © 2016 Sodexis
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from odoo import models, tools
+
 from odoo.addons.component.core import Component
 
 
@@ -31,3 +33,95 @@ class MagentoModelBinder(Component):
         "magento.sale.order.line",
         "magento.account.move",
     ]
+
+    def _get_binding_cache(self):
+        """Return the cache of the bindings of the current sync session
+
+        The cache is created by ``magento.backend.work_on`` and shared by
+        all the components of the session. It maps ``(model, backend id,
+        external id)`` to the id of the binding. Only the found bindings
+        are cached, so a record imported later in the session is searched
+        again until it is bound.
+        """
+        return getattr(self.work, "magento_binding_cache", None)
+
+    def _binding_cache_key(self, external_id):
+        return (self.model._name, self.backend_record.id, tools.ustr(external_id))
+
+    def _wrap_binding(self, binding, unwrap=False):
+        if unwrap:
+            binding = binding[self._odoo_field]
+        return binding.with_context(**self.env.context)
+
+    def to_internal(self, external_id, unwrap=False):
+        """Give the Odoo recordset for an external ID
+
+        The bindings found are kept in the cache of the sync session, so
+        the following calls for the same external ID do not search again.
+        """
+        cache = self._get_binding_cache()
+        if cache is None:
+            return super().to_internal(external_id, unwrap=unwrap)
+        key = self._binding_cache_key(external_id)
+        if key in cache:
+            binding = self.model.with_context(active_test=False).browse(cache[key])
+            return self._wrap_binding(binding, unwrap=unwrap)
+        binding = super().to_internal(external_id)
+        if binding:
+            cache[key] = binding.id
+        return self._wrap_binding(binding, unwrap=unwrap)
+
+    def to_internal_many(self, external_ids, unwrap=False):
+        """Give the Odoo recordsets for several external IDs at once
+
+        The bindings which are not in the cache of the sync session are
+        searched with a single query.
+
+        :return: a dict ``{external_id: recordset}`` where the external IDs
+                 which are not mapped are missing
+        :rtype: dict
+        """
+        cache = self._get_binding_cache()
+        if cache is None:
+            cache = {}
+        model = self.model.with_context(active_test=False)
+        missing = {
+            tools.ustr(external_id)
+            for external_id in external_ids
+            if self._binding_cache_key(external_id) not in cache
+        }
+        if missing:
+            bindings = model.search(
+                [
+                    (self._external_field, "in", list(missing)),
+                    (self._backend_field, "=", self.backend_record.id),
+                ]
+            )
+            for binding in bindings:
+                key = self._binding_cache_key(binding[self._external_field])
+                cache[key] = binding.id
+        result = {}
+        for external_id in external_ids:
+            binding_id = cache.get(self._binding_cache_key(external_id))
+            if binding_id:
+                result[external_id] = self._wrap_binding(
+                    model.browse(binding_id), unwrap=unwrap
+                )
+        return result
+
+    def bind(self, external_id, binding):
+        """Create the link between an external ID and an Odoo ID
+
+        The cache of the sync session is updated with the new link.
+        """
+        cache = self._get_binding_cache()
+        if cache is None:
+            return super().bind(external_id, binding)
+        if not isinstance(binding, models.BaseModel):
+            binding = self.model.browse(binding)
+        # forget the previous external ID when a binding is bound again
+        previous_id = binding[self._external_field]
+        if previous_id:
+            cache.pop(self._binding_cache_key(previous_id), None)
+        super().bind(external_id, binding)
+        cache[self._binding_cache_key(external_id)] = binding.id
@@ -68,14 +68,69 @@ class MagentoBaseExporter(AbstractComponent):
         sync = self.binding.sync_date
         if not sync:
             return True
-        record = self.backend_adapter.read(self.external_id, attributes=["updated_at"])
-        if not record["updated_at"]:
+        updated_at = self._get_magento_updated_at()
+        if not updated_at:
             # in rare case it can be empty, in doubt, import it
             return True
         sync_date = odoo.fields.Datetime.from_string(sync)
-        magento_date = datetime.strptime(record["updated_at"], MAGENTO_DATETIME_FORMAT)
+        magento_date = datetime.strptime(updated_at, MAGENTO_DATETIME_FORMAT)
         return sync_date < magento_date
 
+    def _get_magento_updated_at(self):
+        """Return the update date of the record on Magento
+
+        The date checked beforehand by :meth:`check_freshness` is used
+        when there is one, otherwise the record is read.
+        """
+        updated_dates = getattr(self.work, "magento_updated_dates", None) or {}
+        key = (self.model._name, str(self.external_id))
+        if key in updated_dates:
+            updated_at = updated_dates.pop(key)
+            if updated_at is None:
+                raise IDMissingInBackend
+            return updated_at
+        record = self.backend_adapter.read(self.external_id, attributes=["updated_at"])
+        return record["updated_at"]
+
+    def _uses_should_import(self):
+        """Return True if the export checks the update date on Magento
+
+        Only the generic :meth:`run` calls :meth:`_should_import`, the
+        exporters overriding it do not read the update dates.
+        """
+        return type(self).run is MagentoBaseExporter.run
+
+    def check_freshness(self, bindings):
+        """Read at once the update dates of ``bindings`` on Magento
+
+        The dates are kept in the sync session, :meth:`_should_import`
+        then uses them instead of reading each record before its export.
+        Only for Magento 2.x, does nothing otherwise.
+        """
+        updated_dates = getattr(self.work, "magento_updated_dates", None)
+        if (
+            updated_dates is None
+            or self.collection.version != "2.0"
+            or not self.backend_adapter._magento2_search
+        ):
+            return
+        external_ids = [
+            self.binder.to_external(binding)
+            for binding in bindings
+            if binding.sync_date
+        ]
+        external_ids = [str(external_id) for external_id in external_ids if external_id]
+        if not external_ids:
+            return
+        found = self.backend_adapter.read_updated_dates(external_ids)
+        for external_id in external_ids:
+            key = (self.model._name, external_id)
+            if external_id in found:
+                updated_dates[key] = found[external_id] or ""
+            else:
+                # the record no longer exists on Magento
+                updated_dates[key] = None
+
     def run(self, binding, *args, **kwargs):
         """Run the synchronization
 
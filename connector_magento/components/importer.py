@@ -15,6 +15,7 @@ are already bound, to update the last sync date.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from odoo import _, fields
 
@@ -22,6 +23,8 @@ from odoo.addons.component.core import AbstractComponent, Component
 from odoo.addons.connector.exception import IDMissingInBackend
 from odoo.addons.queue_job.exception import NothingToDoJob
 
+from .backend_adapter import DEFAULT_PAGE_SIZE
+
 _logger = logging.getLogger(__name__)
 
 
@@ -36,11 +39,22 @@ class MagentoImporter(AbstractComponent):
         super().__init__(work_context)
         self.external_id = None
         self.magento_record = None
+        # sync date of the binding before the import
+        self.last_sync_date = None
 
     def _get_magento_data(self):
         """Return the raw Magento data for ``self.external_id``"""
         return self.backend_adapter.read(self.external_id)
 
+    def _prepare_magento_data(self, record):
+        """Adapt the raw Magento data before the import
+
+        Called with the data read by :meth:`_get_magento_data` as well as
+        with the data given to :meth:`run`, for instance by a batch
+        importer which already read the full records.
+        """
+        return record
+
     def _before_import(self):
         """Hook called before the import, when we have the Magento
         data"""
@@ -105,6 +119,40 @@ class MagentoImporter(AbstractComponent):
                     external_id,
                 )
 
+    def _import_dependencies_many(self, external_ids, binding_model, importer=None):
+        """Import several dependencies of the same model.
+
+        The existing bindings are searched at once with
+        ``to_internal_many``, which also keeps them in the binding cache of
+        the sync session for the mappers, and only the missing records are
+        imported.
+
+        :param external_ids: ids of the related bindings to import
+        :param binding_model: name of the binding model for the relation
+        :param importer: component to use for import, by default a new
+                         'record.importer' for each record
+        """
+        external_ids = [
+            external_id for external_id in dict.fromkeys(external_ids) if external_id
+        ]
+        if not external_ids:
+            return
+        existing = self.binder_for(binding_model).to_internal_many(external_ids)
+        for external_id in external_ids:
+            if external_id in existing:
+                continue
+            record_importer = importer or self.component(
+                usage="record.importer", model_name=binding_model
+            )
+            try:
+                record_importer.run(external_id)
+            except NothingToDoJob:
+                _logger.info(
+                    "Dependency import of %s(%s) has been ignored.",
+                    binding_model,
+                    external_id,
+                )
+
     def _import_dependencies(self):
         """Import the dependencies for the record
 
@@ -188,10 +236,12 @@ class MagentoImporter(AbstractComponent):
         )
 
         if data:
-            self.magento_record = data
+            self.magento_record = self._prepare_magento_data(data)
         else:
             try:
-                self.magento_record = self._get_magento_data()
+                self.magento_record = self._prepare_magento_data(
+                    self._get_magento_data()
+                )
             except IDMissingInBackend:
                 return _("Record does no longer exist in Magento")
 
@@ -200,6 +250,7 @@ class MagentoImporter(AbstractComponent):
             return skip
 
         binding = self._get_binding()
+        self.last_sync_date = binding.sync_date if binding else None
 
         if not force and self._is_uptodate(binding):
             return _("Already up-to-date.")
@@ -237,41 +288,150 @@ class BatchImporter(AbstractComponent):
     _inherit = ["base.importer", "base.magento.connector"]
     _usage = "batch.importer"
 
+    def _use_search_read(self):
+        """Return True if the full records are read by the batch search
+
+        The records are then passed to the record importers, which do not
+        need to read them again. Only available for Magento 2.x, where
+        the search APIs return the full records.
+        """
+        return (
+            self.collection.version == "2.0"
+            and self.backend_record.batch_import_full_records
+        )
+
+    def _get_external_id(self, record):
+        """Return the external id of a record returned by ``search_read``"""
+        return record[self.backend_adapter._magento2_key or "id"]
+
+    def _import_records_data(self, records):
+        """Import records returned by ``search_read``"""
+        for record in records:
+            self._import_record(self._get_external_id(record), data=record)
+
+    def _search_pages(self, filters, **kwargs):
+        """Search the records page by page (Magento 2.x), with the page
+        size, the number of parallel requests and the pagination mode of
+        the backend
+
+        Keyword arguments are given to the ``search_pages`` method of
+        the backend adapter.
+        """
+        backend = self.backend_record
+        return self.backend_adapter.search_pages(
+            filters,
+            page_size=backend.import_page_size or DEFAULT_PAGE_SIZE,
+            read=self._use_search_read(),
+            max_workers=backend.import_page_workers,
+            cursor=backend.import_cursor_pagination,
+            **kwargs
+        )
+
+    def _import_pages(self, pages):
+        """Import the records of the pages returned by :meth:`_search_pages`"""
+        use_search_read = self._use_search_read()
+        for page in pages:
+            _logger.info(
+                "search for %s returned %d records", self.model._name, len(page)
+            )
+            if use_search_read:
+                self._import_records_data(page)
+            else:
+                for external_id in page:
+                    self._import_record(external_id)
+
     def run(self, filters=None):
         """Run the synchronization"""
-        record_ids = self.backend_adapter.search(filters)
-        for record_id in record_ids:
-            self._import_record(record_id)
+        if self._use_search_read():
+            self._import_records_data(self.backend_adapter.search_read(filters))
+        else:
+            record_ids = self.backend_adapter.search(filters)
+            for record_id in record_ids:
+                self._import_record(record_id)
+        self._flush_records()
 
-    def _import_record(self, external_id):
+    def _import_record(self, external_id, **kwargs):
         """Import a record directly or delay the import of the record.
 
         Method to implement in sub-classes.
         """
         raise NotImplementedError
 
+    def _flush_records(self):
+        """Hook called at the end of :meth:`run`, once all the records
+        have been given to :meth:`_import_record`
+
+        Sub-classes which buffer the records have to process the
+        remaining ones here.
+        """
+
 
 class DirectBatchImporter(AbstractComponent):
-    """Import the records directly, without delaying the jobs."""
+    """Import the records directly, without delaying the jobs.
+
+    The records are imported in the sync session of the batch import, so
+    they share its caches (bindings, metadata snapshot).
+    """
 
     _name = "magento.direct.batch.importer"
     _inherit = "magento.batch.importer"
 
-    def _import_record(self, external_id):
+    def _import_record(self, external_id, **kwargs):
         """Import the record directly"""
-        self.model.import_record(self.backend_record, external_id)
+        importer = self.component(usage="record.importer")
+        importer.run(external_id, **kwargs)
 
 
 class DelayedBatchImporter(AbstractComponent):
-    """Delay import of the records"""
+    """Delay import of the records
+
+    By default, one job is created for each record. When the chunk size
+    is greater than 1, the records are grouped and each job imports a
+    chunk of records (see ``import_records`` on ``magento.binding``).
+    The chunk size is the ``import_chunk_size`` of the backend, or
+    ``_import_chunk_size`` when the backend has none.
+    """
 
     _name = "magento.delayed.batch.importer"
     _inherit = "magento.batch.importer"
 
+    _import_chunk_size = 1
+
+    def __init__(self, work_context):
+        super().__init__(work_context)
+        self._pending_ids = []
+        self._pending_data = []
+
+    def _get_import_chunk_size(self):
+        """Return the number of records imported by each job"""
+        return self.backend_record.import_chunk_size or self._import_chunk_size
+
     def _import_record(self, external_id, **kwargs):
         """Delay the import of the records"""
+        chunk_size = self._get_import_chunk_size()
+        if chunk_size > 1 and set(kwargs) <= {"data"}:
+            self._pending_ids.append(external_id)
+            self._pending_data.append(kwargs.get("data"))
+            if len(self._pending_ids) >= chunk_size:
+                self._flush_records()
+            return
         self.model.with_delay().import_record(
-            self.backend_record, external_id, **kwargs)
+            self.backend_record, external_id, **kwargs
+        )
+
+    def _flush_records(self):
+        """Delay the import of the pending chunk of records"""
+        super()._flush_records()
+        if not self._pending_ids:
+            return
+        external_ids, self._pending_ids = self._pending_ids, []
+        records, self._pending_data = self._pending_data, []
+        kwargs = {}
+        if any(records):
+            kwargs["records"] = records
+        self.model.with_delay().import_records(
+            self.backend_record, external_ids, **kwargs
+        )
 
 
 class SimpleRecordImporter(Component):
@@ -295,43 +455,104 @@ class TranslationImporter(Component):
     _inherit = "magento.importer"
     _usage = "translation.importer"
 
-    def _get_magento_data(self, storeview=None):
-        """Return the raw Magento data for ``self.external_id``"""
+    def _get_storeview_id(self, storeview):
+        """Return the id of the storeview for the backend adapter"""
         if storeview is None:
-            storeview_id = None
+            return None
         elif self.collection.version == "2.0":
-            storeview_id = storeview.code
-        else:
-            storeview_id = storeview.id
-        return self.backend_adapter.read(self.external_id, storeview_id)
+            return storeview.code
+        return storeview.id
+
+    def _get_magento_data(self, storeview=None):
+        """Return the raw Magento data for ``self.external_id``"""
+        return self.backend_adapter.read(
+            self.external_id, self._get_storeview_id(storeview)
+        )
 
-    def run(self, external_id, binding, mapper=None):
+    def _get_magento_data_many(self, storeviews):
+        """Return the raw Magento data of ``self.external_id`` for each
+        storeview
+
+        With Magento 2.x, the storeviews are read concurrently by up to
+        ``import_translation_workers`` threads. The threads only send the
+        HTTP requests, the request is prepared and the records are adapted
+        in the calling thread.
+        """
+        workers = min(self.backend_record.import_translation_workers, len(storeviews))
+        backend_adapter = self.backend_adapter
+        if (
+            self.collection.version == "1.7"
+            or workers <= 1
+            or not backend_adapter._magento2_key
+        ):
+            return [self._get_magento_data(storeview) for storeview in storeviews]
+        storeview_ids = [self._get_storeview_id(storeview) for storeview in storeviews]
+        resource, params = backend_adapter._read_request(self.external_id)
+        magento_api = self.work.magento_api
+        # make sure the client is created before it is shared by the threads
+        magento_api.api  # noqa: B018
+
+        def read(storeview_id):
+            return magento_api.call(resource, params, storeview=storeview_id)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(read, storeview_ids))
+        return [backend_adapter._read_result(record) for record in records]
+
+    def _is_translation_uptodate(self, magento_record, last_sync_date):
+        """Return True if the translations of the record have not been
+        modified on Magento since the last synchronization
+
+        Only when the backend skips the unchanged translations. Magento
+        updates the date of the record when a storeview value is modified.
+        """
+        if not self.backend_record.skip_unchanged_translations:
+            return False
+        if not magento_record or not magento_record.get("updated_at"):
+            return False
+        if not last_sync_date:
+            return False
+        magento_date = fields.Datetime.from_string(magento_record["updated_at"])
+        return magento_date < last_sync_date
+
+    def run(
+        self,
+        external_id,
+        binding,
+        mapper=None,
+        magento_record=None,
+        last_sync_date=None,
+    ):
+        """Import the translations of the record
+
+        :param magento_record: the record read in the default storeview
+        :param last_sync_date: the sync date of the binding before the
+                               import of the record
+        """
         self.external_id = external_id
-        default_lang = self.backend_record.default_lang_id
-        storeviews = self.env["magento.storeview"].search(
-            [
-                ("backend_id", "=", self.backend_record.id),
-                ("lang_id", "!=", False),
-                ("lang_id", "!=", default_lang.id),
-            ]
+        if self._is_translation_uptodate(magento_record, last_sync_date):
+            return
+        storeview_model = self.env["magento.storeview"]
+        storeviews = storeview_model.browse(
+            storeview_model._get_translation_storeview_ids(
+                self.backend_record.id, self.backend_record.default_lang_id.id
+            )
         )
         if not storeviews:
             return
         lang2storeview = {storeview.lang_id: storeview for storeview in storeviews}
 
         # find the translatable fields of the model
-        fields = self.model.fields_get()
-        translatable_fields = [
-            field for field, attrs in list(fields.items()) if attrs.get("translate")
-        ]
+        translatable_fields = self.model._get_translatable_fields()
 
         if mapper is None:
             mapper = self.mapper
         else:
             mapper = self.component_by_name(mapper)
 
-        for storeview in lang2storeview.values():
-            lang_record = self._get_magento_data(storeview)
+        storeviews = list(lang2storeview.values())
+        lang_records = self._get_magento_data_many(storeviews)
+        for storeview, lang_record in zip(storeviews, lang_records):
             map_record = mapper.map_record(lang_record)
             record = map_record.values()
 
@@ -3,6 +3,7 @@ from . import magento_binding  # should be loaded first for inheritance
 from . import account_invoice
 from . import account_payment_mode
 from . import delivery
+from . import magento_api_metric
 from . import magento_backend
 from . import magento_store
 from . import magento_storeview
@@ -11,6 +12,7 @@ from . import partner
 from . import partner_category
 from . import product
 from . import product_category
+from . import product_pricelist
 from . import queue_job
 from . import sale_order
 from . import stock_picking
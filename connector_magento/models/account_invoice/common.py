@@ -107,18 +107,19 @@ class AccountInvoiceAdapter(Component):
             "order/%s/invoice" % order_increment_id, arguments, http_method="post"
         )
 
-    def search_read(self, filters=None, order_id=None):
+    def search_read(self, filters=None, order_id=None, attributes=None):
         """Search records according to some criterias
         and returns their information
 
         :param order_id: 'order_id' field of the magento sale order, this
                          is not the same field than 'increment_id'
+        :param attributes: fields of the invoices to return (Magento 2.x)
         """
         if filters is None:
             filters = {}
         if order_id is not None:
             filters["order_id"] = {"eq": order_id}
-        return super().search_read(filters=filters)
+        return super().search_read(filters=filters, attributes=attributes)
 
 
 class MagentoBindingInvoiceListener(Component):
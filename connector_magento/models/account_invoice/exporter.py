@@ -106,7 +106,7 @@ class MagentoInvoiceExporter(Component):
 
     def _get_existing_invoice(self, magento_order):
         invoices = self.backend_adapter.search_read(
-            order_id=magento_order.magento_order_id
+            order_id=magento_order.magento_order_id, attributes=["increment_id"]
         )
         if not invoices:
             return
@@ -2,7 +2,7 @@
 # © 2016 Sodexis
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class AccountPaymentMode(models.Model):
@@ -16,3 +16,22 @@ class AccountPaymentMode(models.Model):
         "If nothing is set, the option falls back to the same option "
         "on the Magento store related to the sales order.",
     )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # invalidate the payment modes cached by
+        # magento.backend._lookup_reference
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"name", "active", "company_id"} & set(vals):
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
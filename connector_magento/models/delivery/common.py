@@ -56,3 +56,22 @@ class DeliveryCarrier(models.Model):
         for carrier in self:
             if carrier.magento_code:
                 carrier.magento_carrier_code = carrier.magento_code.split("_")[0]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # invalidate the carriers cached by
+        # magento.backend._lookup_reference
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"magento_code", "active", "company_id"} & set(vals):
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
@@ -0,0 +1,117 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+from ...components.backend_adapter import api_metrics
+
+METRICS_RETENTION_DAYS = 30
+
+
+class MagentoApiMetric(models.Model):
+    """Metrics of the calls to the Magento API
+
+    Each record holds the metrics of one endpoint collected by a process
+    during a flush interval, see
+    :class:`~odoo.addons.connector_magento.components.backend_adapter.CallMetrics`.
+    The lookups of the reference records cached by the imports have
+    records of their own, with the ``lookup`` method.
+    """
+
+    _name = "magento.api.metric"
+    _description = "Magento API Metric"
+    _order = "date desc, latency_p95 desc"
+
+    backend_id = fields.Many2one(
+        comodel_name="magento.backend",
+        string="Magento Backend",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+        index=True,
+    )
+    date = fields.Datetime(required=True, readonly=True)
+    path = fields.Char(
+        string="Resource Path",
+        required=True,
+        readonly=True,
+        help="Template of the resource path, the ids are replaced by {id}. "
+        "For the cached lookups, the model of the records looked up.",
+    )
+    http_method = fields.Char(string="HTTP Method", readonly=True)
+    count = fields.Integer(string="Calls", readonly=True)
+    error_count = fields.Integer(string="Errors", readonly=True)
+    bytes = fields.Integer(string="Bytes Received", readonly=True)
+    latency_p50 = fields.Float(string="P50 (ms)", readonly=True)
+    latency_p95 = fields.Float(string="P95 (ms)", readonly=True)
+    latency_p99 = fields.Float(string="P99 (ms)", readonly=True)
+    latency_max = fields.Float(string="Max (ms)", readonly=True)
+    cache_hits = fields.Integer(readonly=True)
+    cache_hit_rate = fields.Float(string="Cache Hit Rate (%)", readonly=True)
+
+    @api.model
+    def _flush_metrics(self, force=False, new_cursor=False):
+        """Store the metrics collected by the process since the last flush
+
+        The metrics are flushed at most once per flush interval, unless
+        ``force`` is set. With ``new_cursor``, they are committed in a
+        transaction of their own, for the sessions which are rolled back.
+        """
+        if not force and not api_metrics.flush_due():
+            return self.browse()
+        metrics = api_metrics.pop()
+        lookups = api_metrics.pop_lookups()
+        if not new_cursor or self.env.registry.in_test_mode():
+            return self.sudo()._create_metrics(metrics, lookups)
+        with self.env.registry.cursor() as cr:
+            metric_model = self.with_env(self.env(cr=cr, su=True))
+            ids = metric_model._create_metrics(metrics, lookups).ids
+        return self.browse(ids)
+
+    @api.model
+    def _create_metrics(self, metrics, lookups):
+        backend_ids = {backend_id for backend_id, __, __ in metrics}
+        backend_ids |= {backend_id for backend_id, __ in lookups}
+        backend_ids = set(self.env["magento.backend"].browse(backend_ids).exists().ids)
+        now = fields.Datetime.now()
+        vals_list = []
+        for (backend_id, path, http_method), metric in metrics.items():
+            if backend_id not in backend_ids:
+                continue
+            vals_list.append(
+                {
+                    "backend_id": backend_id,
+                    "date": now,
+                    "path": path,
+                    "http_method": http_method,
+                    "count": metric["count"],
+                    "error_count": metric["errors"],
+                    "bytes": metric["bytes"],
+                    "latency_p50": metric["p50"] * 1000,
+                    "latency_p95": metric["p95"] * 1000,
+                    "latency_p99": metric["p99"] * 1000,
+                    "latency_max": metric["max"] * 1000,
+                }
+            )
+        for (backend_id, model_name), lookup in lookups.items():
+            if backend_id not in backend_ids or not lookup["count"]:
+                continue
+            vals_list.append(
+                {
+                    "backend_id": backend_id,
+                    "date": now,
+                    "path": model_name,
+                    "http_method": "lookup",
+                    "count": lookup["count"],
+                    "cache_hits": lookup["hits"],
+                    "cache_hit_rate": 100.0 * lookup["hits"] / lookup["count"],
+                }
+            )
+        return self.create(vals_list)
+
+    @api.autovacuum
+    def _gc_metrics(self):
+        limit = fields.Datetime.now() - timedelta(days=METRICS_RETENTION_DAYS)
+        self.sudo().search([("date", "<", limit)]).unlink()
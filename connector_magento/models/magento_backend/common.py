@@ -6,11 +6,18 @@ import logging
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError
 from odoo.tools import ustr
 
-from ...components.backend_adapter import MagentoAPI, MagentoLocation
+from ...components.backend_adapter import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_POOL_SIZE,
+    MagentoAPI,
+    MagentoLocation,
+    api_metrics,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -91,6 +98,36 @@ class MagentoBackend(models.Model):
     verify_ssl = fields.Boolean(
         string="Verify SSL certificate", default=True, help="Only for Magento 2.0+"
     )
+    http_pool_size = fields.Integer(
+        string="HTTP Connection Pool Size",
+        default=DEFAULT_POOL_SIZE,
+        help="Maximum number of connections kept open to Magento by each "
+        "worker. Only for Magento 2.0+",
+    )
+    http_keep_alive = fields.Boolean(
+        string="HTTP Keep-Alive",
+        default=True,
+        help="Reuse the connections to Magento between requests instead of "
+        "opening a new connection for each call. Only for Magento 2.0+",
+    )
+    http_max_retries = fields.Integer(
+        string="HTTP Connection Retries",
+        default=DEFAULT_MAX_RETRIES,
+        help="Number of times a request is retried when the connection "
+        "fails or has been closed by the server. Only for Magento 2.0+",
+    )
+    collect_api_metrics = fields.Boolean(
+        string="Collect API Metrics",
+        help="Record the number of calls, errors, bytes received and "
+        "latencies of each endpoint of the Magento API. The metrics are "
+        "stored every minute by each worker.",
+    )
+    api_metric_ids = fields.One2many(
+        comodel_name="magento.api.metric",
+        inverse_name="backend_id",
+        string="API Metrics",
+        readonly=True,
+    )
     sale_prefix = fields.Char(
         string="Sale Prefix",
         help="A prefix put before the name of imported sales orders.\n"
@@ -131,6 +168,71 @@ class MagentoBackend(models.Model):
         "without a category will be linked to it.",
     )
 
+    batch_import_full_records = fields.Boolean(
+        string="Read Full Records in Batch Imports",
+        help="Only for Magento 2.0+. The batch imports of products, "
+        "customers and sales orders read the full records with their "
+        "search instead of reading each record separately.",
+    )
+
+    import_page_size = fields.Integer(
+        string="Batch Import Page Size",
+        default=DEFAULT_PAGE_SIZE,
+        help="Only for Magento 2.0+. Number of records fetched by each "
+        "search request of the batch imports.",
+    )
+    import_page_workers = fields.Integer(
+        string="Batch Import Parallel Requests",
+        default=4,
+        help="Only for Magento 2.0+. Maximum number of search pages "
+        "fetched concurrently by the batch imports.",
+    )
+    import_chunk_size = fields.Integer(
+        string="Batch Import Records per Job",
+        help="Number of records imported by each job of the batch imports. "
+        "Leave empty to use the default of each kind of record.",
+    )
+    import_translation_workers = fields.Integer(
+        string="Translation Import Parallel Requests",
+        default=4,
+        help="Only for Magento 2.0+. Maximum number of storeviews read "
+        "concurrently to import the translations of a record.",
+    )
+    skip_unchanged_translations = fields.Boolean(
+        string="Skip Unchanged Translations",
+        help="Do not read the storeviews of a record when it has not "
+        "been modified on Magento since its last synchronization, for "
+        "instance when its import is forced.",
+    )
+    delay_image_import = fields.Boolean(
+        string="Import Images in Separate Jobs",
+        help="The images of the products are downloaded in a job of "
+        "their own, after the import of the product, instead of during "
+        "its import.",
+    )
+    import_cursor_pagination = fields.Boolean(
+        string="Batch Import with Cursor Pagination",
+        help="Only for Magento 2.0+. The batch imports walk the records "
+        "sorted by their id, each page starting after the last id of the "
+        "previous one, instead of using page numbers. The pages are "
+        "faster to fetch on large tables and the records created during "
+        "the import do not shift the pages, but they are fetched one "
+        "after the other.",
+    )
+    category_tree_sync = fields.Boolean(
+        string="Incremental Category Tree Sync",
+        help="Only for Magento 2.0+. The import of the product categories "
+        "reads the tree of categories at once and imports only the "
+        "categories which are new, moved or modified since the last "
+        "import, the parents before their children, in chunked jobs.",
+    )
+    category_tree_chunk_size = fields.Integer(
+        string="Category Tree Sync Chunk Size",
+        default=500,
+        help="Number of categories imported by each job of the "
+        "incremental category tree sync.",
+    )
+
     # TODO? add a field `auto_activate` -> activate a cron
     import_products_from_date = fields.Datetime(
         string="Import products from date",
@@ -148,6 +250,52 @@ class MagentoBackend(models.Model):
         "stock inventory updates.\nIf empty, Quantity Available "
         "is used.",
     )
+    stock_export_mode = fields.Selection(
+        selection=[
+            ("stock_item", "Stock Item of Each Product"),
+            ("source_items", "Source Items in Bulk"),
+        ],
+        default="stock_item",
+        required=True,
+        help="Only for Magento 2.0+. 'Source Items in Bulk' sends the "
+        "quantities of many products in each request to the source items "
+        "API of Magento Inventory (MSI). The changes of the stock options "
+        "(manage stock, backorders) are still exported per product.",
+    )
+    stock_source_code = fields.Char(
+        string="Stock Source Code",
+        default="default",
+        help="Code of the Magento Inventory source receiving the quantities "
+        "exported in bulk.",
+    )
+    stock_export_batch_size = fields.Integer(
+        default=500,
+        help="Number of products whose quantity is sent in each request of "
+        "the bulk stock exports.",
+    )
+    aggregate_stock_qty = fields.Boolean(
+        string="Aggregated Stock Quantities",
+        help="Compute the 'Quantity On Hand' and 'Forecasted Quantity' "
+        "stock fields with SQL aggregations on the quants and moves of the "
+        "stock location, for many products at once, instead of the "
+        "computation of the product fields. Do not use it when the "
+        "quantities of the products are computed differently, for "
+        "instance for the kits.",
+    )
+    incremental_stock_update = fields.Boolean(
+        string="Incremental Stock Updates",
+        help="The update of the stock quantities only recomputes the "
+        "products having stock moves or quants modified in the stock "
+        "location of the warehouse since the previous update, and the "
+        "products bound since then. Not suitable when the stock field "
+        "depends on other data than the stock moves and quants.",
+    )
+    stock_updated_until = fields.Datetime(
+        string="Stock Updated Until",
+        help="Date of the last update of the stock quantities. The next "
+        "incremental update only checks the stock changes after this "
+        "date. Empty it to update the quantities of all the products.",
+    )
     product_binding_ids = fields.One2many(
         comodel_name="magento.product.product",
         inverse_name="backend_id",
@@ -214,15 +362,69 @@ class MagentoBackend(models.Model):
             magento_location.use_auth_basic = True
             magento_location.auth_basic_username = self.auth_basic_username
             magento_location.auth_basic_password = self.auth_basic_password
+        magento_location.pool_size = self.http_pool_size or DEFAULT_POOL_SIZE
+        magento_location.keep_alive = self.http_keep_alive
+        magento_location.max_retries = self.http_max_retries
+        magento_location.backend_id = self.id
+        magento_location.collect_metrics = self.collect_api_metrics
+        # The bindings found by the binders are cached for the whole
+        # sync session, see ``MagentoModelBinder.to_internal``.
+        kwargs.setdefault("magento_binding_cache", {})
+        # The lists of websites, store groups and storeviews searched and
+        # read by the backend adapters are kept for the sync session as
+        # well, see ``GenericAdapter._snapshot_records``.
+        kwargs.setdefault("magento_metadata_snapshot", {})
+        # The update dates of the records checked before their export,
+        # see ``MagentoBaseExporter.check_freshness``.
+        kwargs.setdefault("magento_updated_dates", {})
+        collect_metrics = self.collect_api_metrics
         # We create a Magento Client API here, so we can create the
         # client once (lazily on the first use) and propagate it
         # through all the sync session, instead of recreating a client
         # in each backend adapter usage.
-        with MagentoAPI(magento_location) as magento_api:
-            _super = super()
-            # from the components we'll be able to do: self.work.magento_api
-            with _super.work_on(model_name, magento_api=magento_api, **kwargs) as work:
-                yield work
+        try:
+            with MagentoAPI(magento_location) as magento_api:
+                _super = super()
+                # from the components we'll be able to do: self.work.magento_api
+                with _super.work_on(
+                    model_name, magento_api=magento_api, **kwargs
+                ) as work:
+                    yield work
+        except Exception:
+            if collect_metrics:
+                # the transaction of the failed session will be rolled back
+                self.env["magento.api.metric"]._flush_metrics(new_cursor=True)
+            raise
+        if collect_metrics:
+            self.env["magento.api.metric"]._flush_metrics()
+
+    def _lookup_reference(self, model_name, domain):
+        """Return the first record of ``model_name`` matching ``domain``
+
+        Used for the reference records looked up by every imported sales
+        order (payment modes, carriers, pricelists), the ids found are
+        cached until a record of these models is modified.
+        """
+        self.ensure_one()
+        if self.collect_api_metrics:
+            api_metrics.record_lookup((self.id, model_name))
+        record_id = self._search_reference_id(self.id, model_name, tuple(domain))
+        return self.env[model_name].browse(record_id)
+
+    @api.model
+    @tools.ormcache(
+        "self.env.uid",
+        "self.env.company.id",
+        "self.env.lang",
+        "backend_id",
+        "model_name",
+        "domain",
+    )
+    def _search_reference_id(self, backend_id, model_name, domain):
+        """Search the reference record for :meth:`_lookup_reference`"""
+        if self.browse(backend_id).collect_api_metrics:
+            api_metrics.record_lookup((backend_id, model_name), miss=True)
+        return self.env[model_name].search(list(domain), limit=1).id
 
     def synchronize_metadata(self):
         try:
@@ -311,11 +513,56 @@ class MagentoBackend(models.Model):
             ("no_stock_sync", "=", False),
         ]
 
+    def _get_stock_changed_product_ids(self, since):
+        """Return the ids of the products whose stock changed since a date
+
+        Only the stock moves and quants of the stock location of the
+        warehouse (and its children) are considered.
+        """
+        self.ensure_one()
+        location = self.warehouse_id.lot_stock_id
+        moves = self.env["stock.move"].search(
+            [
+                ("write_date", ">=", since),
+                "|",
+                ("location_id", "child_of", location.id),
+                ("location_dest_id", "child_of", location.id),
+            ]
+        )
+        quants = self.env["stock.quant"].search(
+            [
+                ("write_date", ">=", since),
+                ("location_id", "child_of", location.id),
+            ]
+        )
+        return (moves.mapped("product_id") | quants.mapped("product_id")).ids
+
     def update_product_stock_qty(self):
         mag_product_obj = self.env["magento.product.product"]
-        domain = self._domain_for_update_product_stock_qty()
-        magento_products = mag_product_obj.search(domain)
-        magento_products.recompute_magento_qty()
+        # same buffer as the imports for the transactions still running
+        start_time = datetime.now() - timedelta(seconds=IMPORT_DELTA_BUFFER)
+        incremental = self.filtered(
+            lambda backend: backend.incremental_stock_update
+            and backend.stock_updated_until
+        )
+        full = self - incremental
+        if full:
+            domain = full._domain_for_update_product_stock_qty()
+            magento_products = mag_product_obj.search(domain)
+            magento_products.recompute_magento_qty()
+        for backend in incremental:
+            since = backend.stock_updated_until
+            product_ids = backend._get_stock_changed_product_ids(since)
+            domain = backend._domain_for_update_product_stock_qty() + [
+                "|",
+                ("odoo_id", "in", product_ids),
+                ("create_date", ">=", since),
+            ]
+            magento_products = mag_product_obj.search(domain)
+            magento_products.recompute_magento_qty()
+        self.filtered("incremental_stock_update").write(
+            {"stock_updated_until": fields.Datetime.to_string(start_time)}
+        )
         return True
 
     @api.model
@@ -1,7 +1,14 @@
 # © 2013-2019 Guewen Baconnier,Camptocamp SA,Akretion
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+import logging
+
+from odoo import _, api, fields, models, tools
+from odoo.tools import split_every
+
+from odoo.addons.queue_job.exception import NothingToDoJob
+
+_logger = logging.getLogger(__name__)
 
 
 class MagentoBinding(models.AbstractModel):
@@ -34,6 +41,17 @@ class MagentoBinding(models.AbstractModel):
         ),
     ]
 
+    EXPORT_CHUNK_SIZE = 100  # records checked at a time before the exports
+
+    @api.model
+    @tools.ormcache()
+    def _get_translatable_fields(self):
+        """Return the names of the translatable fields of the model
+
+        Cached per model for the lifetime of the registry.
+        """
+        return tuple(name for name, field in self._fields.items() if field.translate)
+
     @api.model
     def import_batch(self, backend, filters=None):
         """Prepare the import of records modified on Magento"""
@@ -44,18 +62,90 @@ class MagentoBinding(models.AbstractModel):
             return importer.run(filters=filters)
 
     @api.model
-    def import_record(self, backend, external_id, force=False):
-        """Import a Magento record"""
+    def import_record(self, backend, external_id, force=False, data=None):
+        """Import a Magento record
+
+        :param data: the Magento record when it has already been read,
+                     for instance by a batch import
+        """
         with backend.work_on(self._name) as work:
             importer = work.component(usage="record.importer")
-            return importer.run(external_id, force=force)
+            return importer.run(external_id, force=force, data=data)
+
+    @api.model
+    def import_records(self, backend, external_ids, records=None, force=False):
+        """Import a chunk of Magento records in the same transaction
+
+        Each record is imported in its own savepoint. When the import of
+        a record fails, it is rolled back and a separate job is created
+        to import it, so the failure does not prevent the import of the
+        other records of the chunk.
+
+        :param records: the Magento records, in the same order than
+                        ``external_ids``, when they have already been read
+        :param force: import the records even when they are up-to-date
+        """
+        if records is None:
+            records = [None] * len(external_ids)
+        failed = []
+        with backend.work_on(self._name) as work:
+            for external_id, data in zip(external_ids, records):
+                importer = work.component(usage="record.importer")
+                try:
+                    with self.env.cr.savepoint():
+                        importer.run(external_id, force=force, data=data)
+                except NothingToDoJob:
+                    continue
+                except Exception as err:
+                    # the bindings cached by the failed import may have
+                    # been rolled back
+                    work.magento_binding_cache.clear()
+                    _logger.info(
+                        "Import of %s %s failed in a chunk, delayed "
+                        "in a separate job: %s",
+                        self._name,
+                        external_id,
+                        err,
+                    )
+                    failed.append(external_id)
+                    self.with_delay().import_record(
+                        backend, external_id, force=force, data=data
+                    )
+        message = _("%d records imported.") % (len(external_ids) - len(failed))
+        if failed:
+            message += " " + _("Import delayed in separate jobs for: %s") % ", ".join(
+                str(external_id) for external_id in failed
+            )
+        return message
 
     def export_record(self, fields=None):
         """Export a record on Magento"""
         self.ensure_one()
-        with self.backend_id.work_on(self._name) as work:
-            exporter = work.component(usage="record.exporter")
-            return exporter.run(self, fields)
+        return self.export_records(fields)[0]
+
+    def export_records(self, fields=None):
+        """Export several records on Magento
+
+        Before the exports, the update dates of the records on Magento
+        are read with one request per chunk of records instead of one
+        request per record, when the exporter checks them.
+
+        :return: the results of the exports, in the order of the records
+        """
+        results = {}
+        for backend in self.mapped("backend_id"):
+            bindings = self.filtered(lambda binding: binding.backend_id == backend)
+            with backend.work_on(self._name) as work:
+                freshness_checker = work.component(usage="record.exporter")
+                check_freshness = freshness_checker._uses_should_import()
+                for chunk_ids in split_every(self.EXPORT_CHUNK_SIZE, bindings.ids):
+                    chunk = self.browse(chunk_ids)
+                    if check_freshness:
+                        freshness_checker.check_freshness(chunk)
+                    for binding in chunk:
+                        exporter = work.component(usage="record.exporter")
+                        results[binding.id] = exporter.run(binding, fields)
+        return [results[binding_id] for binding_id in self.ids]
 
     def export_delete_record(self, backend, external_id):
         """Delete a record on Magento"""
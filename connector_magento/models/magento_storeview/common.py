@@ -5,7 +5,7 @@
 import logging
 from datetime import datetime, timedelta
 
-from odoo import fields, models
+from odoo import api, fields, models, tools
 
 from odoo.addons.component.core import Component
 
@@ -59,6 +59,38 @@ class MagentoStoreview(models.Model):
     catalog_price_tax_included = fields.Boolean(string="Prices include tax")
     is_multi_company = fields.Boolean(related="backend_id.is_multi_company")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # invalidate the storeviews cached by _get_translation_storeview_ids
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"lang_id", "store_id", "backend_id"} & set(vals):
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
+    @api.model
+    @tools.ormcache("backend_id", "default_lang_id")
+    def _get_translation_storeview_ids(self, backend_id, default_lang_id):
+        """Return the ids of the storeviews of a backend which have another
+        language than the default one, as a tuple
+
+        The result is cached until a storeview or a language is modified
+        (the changes of languages clear the caches of the registry).
+        """
+        domain = [("backend_id", "=", backend_id), ("lang_id", "!=", False)]
+        if default_lang_id:
+            domain.append(("lang_id", "!=", default_lang_id))
+        return tuple(self.search(domain).ids)
+
     def import_sale_orders(self):
         import_start_time = datetime.now()
         for storeview in self:
@@ -123,19 +155,11 @@ class StoreviewAdapter(Component):
         :rtype: dict
         """
         if self.collection.version == "2.0":
+            storeview = self._read_snapshot("store/storeViews", external_id)
+            storeview.update(self._read_snapshot("store/storeConfigs", external_id))
             if attributes:
-                raise NotImplementedError
-            storeview = next(
-                record
-                for record in self._call("store/storeViews")
-                if record["id"] == external_id
-            )
-            storeview.update(
-                next(
-                    record
-                    for record in self._call("store/storeConfigs")
-                    if record["id"] == external_id
-                )
-            )
+                storeview = {
+                    key: storeview[key] for key in attributes if key in storeview
+                }
             return storeview
         return super().read(external_id, attributes=attributes)
@@ -170,14 +170,10 @@ class PartnerAdapter(Component):
             else:
                 raise
 
-    def search(
+    def _search_filters(
         self, filters=None, from_date=None, to_date=None, magento_website_ids=None
     ):
-        """Search records according to some criteria and return a
-        list of ids
-
-        :rtype: list
-        """
+        """Add the update dates and websites to the search filters"""
         if filters is None:
             filters = {}
 
@@ -191,11 +187,69 @@ class PartnerAdapter(Component):
             filters["updated_at"]["to"] = to_date.strftime(dt_fmt)
         if magento_website_ids is not None:
             filters["website_id"] = {"in": magento_website_ids}
+        return filters
+
+    def search(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_website_ids=None,
+        **kwargs
+    ):
+        """Search records according to some criteria and return a
+        list of ids
 
+        :rtype: list
+        """
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_website_ids=magento_website_ids,
+        )
         if self.collection.version == "1.7":
             # the search method is on ol_customer instead of customer
             return self._call("ol_customer.search", [filters] if filters else [{}])
-        return super().search(filters=filters)
+        return super().search(filters=filters, **kwargs)
+
+    def search_read(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_website_ids=None,
+        **kwargs
+    ):
+        """Search records according to some criteria and return
+        their information
+
+        :rtype: list
+        """
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_website_ids=magento_website_ids,
+        )
+        return super().search_read(filters=filters, **kwargs)
+
+    def search_pages(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_website_ids=None,
+        **kwargs
+    ):
+        """Search records page by page"""
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_website_ids=magento_website_ids,
+        )
+        return super().search_pages(filters=filters, **kwargs)
 
 
 class AddressAdapter(Component):
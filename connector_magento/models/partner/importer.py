@@ -27,20 +27,35 @@ class PartnerBatchImporter(Component):
     _inherit = "magento.delayed.batch.importer"
     _apply_on = "magento.res.partner"
 
+    _import_chunk_size = 100
+
     def run(self, filters=None):
         """Run the synchronization"""
         from_date = filters.pop("from_date", None)
         to_date = filters.pop("to_date", None)
         magento_website_ids = [filters.pop("magento_website_id")]
-        record_ids = self.backend_adapter.search(
-            filters,
-            from_date=from_date,
-            to_date=to_date,
-            magento_website_ids=magento_website_ids,
-        )
-        _logger.info("search for magento partners %s returned %s", filters, record_ids)
-        for record_id in record_ids:
-            self._import_record(record_id)
+        if self.collection.version == "1.7":
+            record_ids = self.backend_adapter.search(
+                filters,
+                from_date=from_date,
+                to_date=to_date,
+                magento_website_ids=magento_website_ids,
+            )
+            _logger.info(
+                "search for magento partners %s returned %s", filters, record_ids
+            )
+            for record_id in record_ids:
+                self._import_record(record_id)
+        else:
+            self._import_pages(
+                self._search_pages(
+                    filters,
+                    from_date=from_date,
+                    to_date=to_date,
+                    magento_website_ids=magento_website_ids,
+                )
+            )
+        self._flush_records()
 
 
 class PartnerImportMapper(Component):
@@ -173,7 +188,9 @@ class PartnerImporter(Component):
     def _after_import(self, partner_binding):
         """Import the addresses"""
         book = self.component(usage="address.book", model_name="magento.address")
-        book.import_addresses(self.external_id, partner_binding.id)
+        book.import_addresses(
+            self.external_id, partner_binding.id, partner_record=self.magento_record
+        )
 
 
 AddressInfos = namedtuple(
@@ -214,16 +231,21 @@ class PartnerAddressBook(Component):
     _apply_on = "magento.address"
     _usage = "address.book"
 
-    def import_addresses(self, magento_partner_id, partner_binding_id):
-        addresses = self._get_address_infos(magento_partner_id, partner_binding_id)
+    def import_addresses(
+        self, magento_partner_id, partner_binding_id, partner_record=None
+    ):
+        addresses = self._get_address_infos(
+            magento_partner_id, partner_binding_id, partner_record=partner_record
+        )
         for address_id, infos in addresses:
             importer = self.component(usage="record.importer")
             importer.run(address_id, address_infos=infos)
 
-    def _read_addresses(self, magento_partner_id):
+    def _read_addresses(self, magento_partner_id, partner_record=None):
         """Provide addresses
         - Magento 1.x: read the addresses from the address repository
-        - Magento 2.x: addresses are included in the partner record
+        - Magento 2.x: addresses are included in the partner record, which
+          is read again unless it is given in ``partner_record``
         """
         if self.collection.version == "1.7":
             adapter = self.component(usage="backend.adapter")
@@ -234,13 +256,20 @@ class PartnerAddressBook(Component):
                 (address_id, adapter.read(address_id)) for address_id in mag_address_ids
             ]
 
-        with self.collection.work_on("magento.res.partner") as partner:
-            adapter = partner.component(usage="backend.adapter")
-            record = adapter.read(magento_partner_id)
+        if partner_record is not None and "addresses" in partner_record:
+            record = partner_record
+        else:
+            with self.collection.work_on("magento.res.partner") as partner:
+                adapter = partner.component(usage="backend.adapter")
+                record = adapter.read(magento_partner_id)
         return [(addr["id"], addr) for addr in record["addresses"]]
 
-    def _get_address_infos(self, magento_partner_id, partner_binding_id):
-        for address_id, magento_record in self._read_addresses(magento_partner_id):
+    def _get_address_infos(
+        self, magento_partner_id, partner_binding_id, partner_record=None
+    ):
+        for address_id, magento_record in self._read_addresses(
+            magento_partner_id, partner_record=partner_record
+        ):
             # defines if the billing address is merged with the partner
             # or imported as a standalone contact
             merge = False
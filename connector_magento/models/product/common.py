@@ -6,8 +6,11 @@ import logging
 import xmlrpc.client
 from collections import defaultdict
 
+import requests
+
 from odoo import api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import float_round
 from odoo.tools.translate import _
 
 from odoo.addons.component.core import Component
@@ -18,6 +21,12 @@ from ...components.backend_adapter import MAGENTO_DATETIME_FORMAT
 
 _logger = logging.getLogger(__name__)
 
+# stock fields which can be computed by
+# :meth:`MagentoProductProduct._get_aggregated_stock_qty`
+AGGREGATED_STOCK_FIELDS = ("qty_available", "virtual_available")
+# states of the moves counted in the forecasted quantity
+PENDING_MOVE_STATES = ("waiting", "confirmed", "assigned", "partially_available")
+
 
 def chunks(items, length):
     for index in range(0, len(items), length):
@@ -101,6 +110,30 @@ class MagentoProductProduct(models.Model):
         help="Check this to exclude the product " "from stock synchronizations.",
     )
 
+    magento_stock_item_id = fields.Integer(
+        string="Stock Item ID (on Magento)",
+        readonly=True,
+        help="Magento 2: id of the stock item of the product in the default "
+        "stock, used to export its inventory.",
+    )
+    magento_image_file = fields.Char(
+        string="Image File (on Magento)",
+        readonly=True,
+        help="Path of the last image imported from Magento.",
+    )
+    magento_image_checksum = fields.Char(
+        string="Image Checksum",
+        readonly=True,
+        help="SHA-1 checksum of the last image imported from Magento, "
+        "an image with the same checksum is not written again.",
+    )
+    magento_image_etag = fields.Char(
+        string="Image ETag",
+        readonly=True,
+        help="ETag of the last image downloaded from Magento, used to "
+        "download the image only when it has been modified.",
+    )
+
     RECOMPUTE_QTY_STEP = 1000  # products at a time
 
     def export_inventory(self, fields=None):
@@ -110,6 +143,97 @@ class MagentoProductProduct(models.Model):
             exporter = work.component(usage="product.inventory.exporter")
             return exporter.run(self, fields)
 
+    def export_inventory_bulk(self):
+        """Export the quantity of several products in bulk
+
+        The products are sent by batches to the source items API of
+        Magento 2. The products which could not be exported get their own
+        ``export_inventory`` job.
+        """
+        for backend in self.mapped("backend_id"):
+            bindings = self.filtered(lambda binding: binding.backend_id == backend)
+            batch_size = backend.stock_export_batch_size or len(bindings)
+            with backend.work_on(self._name) as work:
+                exporter = work.component(usage="product.inventory.exporter")
+                for chunk_ids in chunks(bindings.ids, batch_size):
+                    failed = exporter.run_bulk(self.browse(chunk_ids))
+                    failed._delay_export_inventory(["magento_qty"])
+        return True
+
+    def _inventory_export_identity_key(self):
+        self.ensure_one()
+        return "%s,%s.export_inventory" % (self._name, self.id)
+
+    def _delay_export_inventory(self, fields):
+        """Delay the export of the inventory of the products
+
+        A product has at most one pending inventory export job: when a job
+        is still waiting, the fields are added to its fields instead of
+        creating a new job. The job reads the inventory of the product
+        when it is executed, so it always exports the latest quantity.
+
+        Only the pending jobs which are not locked by the jobrunner are
+        completed. The enqueued jobs may already be read by a worker, a
+        new job is created next to them.
+
+        :param fields: inventory fields to export
+        """
+        job_model = self.env["queue.job"].sudo()
+        identity_keys = {
+            binding.id: binding._inventory_export_identity_key() for binding in self
+        }
+        jobs = job_model.search(
+            [
+                ("identity_key", "in", list(identity_keys.values())),
+                ("state", "in", ("pending", "enqueued")),
+            ],
+            order="id",
+        )
+        pending_jobs = jobs.filtered(lambda job: job.state == "pending")
+        free_ids = set()
+        if pending_jobs:
+            self.env.cr.execute(
+                "SELECT id FROM queue_job WHERE id IN %s AND state = 'pending' "
+                "FOR UPDATE SKIP LOCKED",
+                (tuple(pending_jobs.ids),),
+            )
+            free_ids = {row[0] for row in self.env.cr.fetchall()}
+        free_jobs = {job.identity_key: job for job in jobs if job.id in free_ids}
+        busy_keys = set(jobs.mapped("identity_key"))
+        for binding in self:
+            identity_key = identity_keys[binding.id]
+            job = free_jobs.get(identity_key)
+            if job is None and identity_key in busy_keys:
+                # the identity key would return the busy job instead of
+                # creating a new one, it is only set on the new job
+                new_job = binding.with_delay(priority=20).export_inventory(
+                    fields=sorted(fields)
+                )
+                new_job.db_record().identity_key = identity_key
+                continue
+            if job is None:
+                binding.with_delay(
+                    priority=20, identity_key=identity_key
+                ).export_inventory(fields=sorted(fields))
+                continue
+            job_fields = job.kwargs.get("fields") or []
+            if not set(fields).issubset(job_fields):
+                job.kwargs = dict(
+                    job.kwargs, fields=sorted(set(job_fields).union(fields))
+                )
+
+    def import_images(self, images=None):
+        """Import the image of a product
+
+        :param images: the images of the product as returned by the
+                       ``get_images`` method of the backend adapter, they
+                       are read from Magento when None
+        """
+        self.ensure_one()
+        with self.backend_id.work_on(self._name) as work:
+            importer = work.component(usage="product.image.importer")
+            return importer.run(self.external_id, self, images=images)
+
     def recompute_magento_qty(self):
         """Check if the quantity in the stock location configured
         on the backend has changed since the last export.
@@ -149,17 +273,128 @@ class MagentoProductProduct(models.Model):
         else:
             location = backend.warehouse_id.lot_stock_id
 
-        product_fields = ["magento_qty", stock_field]
+        aggregated = (
+            backend.aggregate_stock_qty and stock_field in AGGREGATED_STOCK_FIELDS
+        )
+        product_fields = ["magento_qty"]
+        if not aggregated:
+            product_fields.append(stock_field)
         if read_fields:
             product_fields += read_fields
 
         self_with_location = self.with_context(location=location.id)
         for chunk_ids in chunks(products.ids, self.RECOMPUTE_QTY_STEP):
             records = self_with_location.browse(chunk_ids)
-            for product in records.read(fields=product_fields):
+            product_values = records.read(fields=product_fields)
+            if aggregated:
+                quantities = records._get_aggregated_stock_qty(location, stock_field)
+                for product in product_values:
+                    product[stock_field] = quantities[product["id"]]
+            ids_by_qty = defaultdict(list)
+            for product in product_values:
                 new_qty = self._magento_qty(product, backend, location, stock_field)
                 if new_qty != product["magento_qty"]:
-                    self.browse(product["id"]).magento_qty = new_qty
+                    ids_by_qty[new_qty].append(product["id"])
+            self._write_magento_qty(ids_by_qty)
+
+    def _get_aggregated_stock_qty(self, location, stock_field):
+        """Return the stock quantities of the products in a location
+
+        Compute the same quantities as the ``qty_available`` and
+        ``virtual_available`` fields of the products, for all the bindings
+        at once, with a few SQL aggregations on the quants and the moves
+        of the location and its children.
+
+        :param location: stock location
+        :param stock_field: ``qty_available`` or ``virtual_available``
+        :return: dict ``{binding id: quantity}``
+        """
+        product_ids = {binding.id: binding.odoo_id.id for binding in self}
+        if not product_ids:
+            return {}
+        self.env["stock.location"].flush_model(["parent_path"])
+        self.env["stock.quant"].flush_model(["product_id", "location_id", "quantity"])
+        self.env["stock.move"].flush_model(
+            ["product_id", "product_qty", "state", "location_id", "location_dest_id"]
+        )
+        params = {
+            "product_ids": tuple(set(product_ids.values())),
+            "path": "%s%%" % location.parent_path,
+            "states": PENDING_MOVE_STATES,
+        }
+        cr = self.env.cr
+        cr.execute(
+            """
+            SELECT p.id, u.rounding
+            FROM product_product p
+            JOIN product_template t ON t.id = p.product_tmpl_id
+            JOIN uom_uom u ON u.id = t.uom_id
+            WHERE p.id IN %(product_ids)s
+            """,
+            params,
+        )
+        roundings = dict(cr.fetchall())
+        quantities = defaultdict(float)
+        cr.execute(
+            """
+            SELECT q.product_id, SUM(q.quantity)
+            FROM stock_quant q
+            JOIN stock_location l ON l.id = q.location_id
+            WHERE q.product_id IN %(product_ids)s
+            AND l.parent_path LIKE %(path)s
+            GROUP BY q.product_id
+            """,
+            params,
+        )
+        for product_id, qty in cr.fetchall():
+            quantities[product_id] += qty
+        if stock_field == "virtual_available":
+            # incoming moves are added, outgoing moves are subtracted,
+            # moves inside the location are ignored
+            cr.execute(
+                """
+                SELECT m.product_id,
+                       SUM(CASE WHEN dest.parent_path LIKE %(path)s
+                                THEN m.product_qty
+                                ELSE -m.product_qty END)
+                FROM stock_move m
+                JOIN stock_location src ON src.id = m.location_id
+                JOIN stock_location dest ON dest.id = m.location_dest_id
+                WHERE m.product_id IN %(product_ids)s
+                AND m.state IN %(states)s
+                AND (src.parent_path LIKE %(path)s)
+                    != (dest.parent_path LIKE %(path)s)
+                GROUP BY m.product_id
+                """,
+                params,
+            )
+            for product_id, qty in cr.fetchall():
+                quantities[product_id] += qty
+        return {
+            binding_id: float_round(
+                quantities[product_id], precision_rounding=roundings[product_id]
+            )
+            for binding_id, product_id in product_ids.items()
+        }
+
+    def _write_magento_qty(self, ids_by_qty):
+        """Write the new quantities of the products, grouped by quantity
+
+        The listeners are notified once for all the products with an
+        ``on_record_write_batch`` event instead of an ``on_record_write``
+        event for each product.
+
+        :param ids_by_qty: dict ``{new quantity: [binding ids]}``
+        """
+        changed = self.browse()
+        for new_qty, binding_ids in ids_by_qty.items():
+            bindings = self.browse(binding_ids)
+            bindings.with_context(connector_no_export=True).write(
+                {"magento_qty": new_qty}
+            )
+            changed |= bindings
+        if changed:
+            self._event("on_record_write_batch").notify(changed, fields=["magento_qty"])
 
     def _magento_qty(self, product, backend, location, stock_field):
         """Return the current quantity for one product.
@@ -212,6 +447,8 @@ class ProductProductAdapter(Component):
     _magento2_model = "products"
     _magento2_search = "products"
     _magento2_key = "sku"
+    _magento2_cursor_key = "id"
+    _magento2_cursor_field = "entity_id"
     _admin_path = "/{model}/edit/id/{id}"
 
     def _call(self, method, arguments, http_method=None, storeview=None):
@@ -227,12 +464,8 @@ class ProductProductAdapter(Component):
             else:
                 raise
 
-    def search(self, filters=None, from_date=None, to_date=None):
-        """Search records according to some criteria
-        and returns a list of ids
-
-        :rtype: list
-        """
+    def _search_filters(self, filters=None, from_date=None, to_date=None):
+        """Add the update dates to the search filters"""
         if filters is None:
             filters = {}
         dt_fmt = MAGENTO_DATETIME_FORMAT
@@ -242,6 +475,15 @@ class ProductProductAdapter(Component):
         if to_date is not None:
             filters.setdefault("updated_at", {})
             filters["updated_at"]["to"] = to_date.strftime(dt_fmt)
+        return filters
+
+    def search(self, filters=None, from_date=None, to_date=None, **kwargs):
+        """Search records according to some criteria
+        and returns a list of ids
+
+        :rtype: list
+        """
+        filters = self._search_filters(filters, from_date=from_date, to_date=to_date)
         if self.collection.version == "1.7":
             # TODO add a search entry point on the Magento API
             return [
@@ -250,7 +492,38 @@ class ProductProductAdapter(Component):
                     "%s.list" % self._magento_model, [filters] if filters else [{}]
                 )
             ]
-        return super().search(filters=filters)
+        return super().search(filters=filters, **kwargs)
+
+    @staticmethod
+    def _flatten_custom_attributes(record):
+        """Magento 2.x: expose the custom attributes as regular keys"""
+        for attr in record.get("custom_attributes", []):
+            record[attr["attribute_code"]] = attr["value"]
+        return record
+
+    def search_read(self, filters=None, from_date=None, to_date=None, **kwargs):
+        """Search records according to some criteria
+        and returns their information
+
+        :rtype: list
+        """
+        filters = self._search_filters(filters, from_date=from_date, to_date=to_date)
+        res = super().search_read(filters=filters, **kwargs)
+        if self.collection.version == "2.0":
+            res = [self._flatten_custom_attributes(record) for record in res]
+        return res
+
+    def search_pages(self, filters=None, from_date=None, to_date=None, **kwargs):
+        """Search records page by page
+
+        The custom attributes of the records are flattened as in
+        :meth:`read`.
+        """
+        filters = self._search_filters(filters, from_date=from_date, to_date=to_date)
+        for page in super().search_pages(filters=filters, **kwargs):
+            if kwargs.get("read"):
+                page = [self._flatten_custom_attributes(record) for record in page]
+            yield page
 
     def read(self, external_id, storeview_id=None, attributes=None):
         """Returns the information of a record
@@ -263,13 +536,13 @@ class ProductProductAdapter(Component):
                 "ol_catalog_product.info",
                 [int(external_id), storeview_id, attributes, "id"],
             )
-        res = super().read(
-            external_id, attributes=attributes, storeview=storeview_id
-        )
-        if res:
-            for attr in res.get("custom_attributes", []):
-                res[attr["attribute_code"]] = attr["value"]
-        return res
+        return super().read(external_id, attributes=attributes, storeview=storeview_id)
+
+    def _read_result(self, record):
+        record = super()._read_result(record)
+        if record:
+            self._flatten_custom_attributes(record)
+        return record
 
     def write(self, external_id, data, storeview_id=None):
         """Update records on the external system"""
@@ -317,9 +590,14 @@ class ProductProductAdapter(Component):
             )
         raise NotImplementedError  # TODO
 
-    def update_inventory(self, external_id, data):
+    def update_inventory(self, external_id, data, item_id=None):
         """Update the default stock. For Magento2, first retrieve the stock
-        item that applies to this stock for the product."""
+        item that applies to this stock for the product, unless its
+        ``item_id`` is given. It is looked up again if the given one
+        does not exist anymore.
+
+        :return: Magento 2: the id of the stock item which has been updated
+        """
         if self.collection.version == "1.7":
             # product_stock.update is too slow
             return self._call(
@@ -328,25 +606,50 @@ class ProductProductAdapter(Component):
 
         # Magento2
         data = {"stockItem": data}
+        if item_id:
+            try:
+                self._update_stock_item(external_id, item_id, data)
+                return item_id
+            except requests.HTTPError as err:
+                if err.response is None or err.response.status_code != 404:
+                    raise
+        item_id = self._get_stock_item_id(external_id)
+        self._update_stock_item(external_id, item_id, data)
+        return item_id
+
+    def _get_stock_item_id(self, external_id):
+        """Magento 2: return the id of the stock item of a product in the
+        default stock"""
         res = self._call("stockItems/%s" % self.escape(external_id), None)
         if isinstance(res, dict):
             res = [res]
-        item_id = 0
         for item in res:
             if item["stock_id"] == 1:
-                item_id = item["item_id"]
-                break
-        else:
-            raise ValueError(
-                "No stock item found for product %s for default stock_id 1"
-                % external_id
-            )
-        self._call(
+                return item["item_id"]
+        raise ValueError(
+            "No stock item found for product %s for default stock_id 1" % external_id
+        )
+
+    def _update_stock_item(self, external_id, item_id, data):
+        return self._call(
             "products/{}/stockItems/{}".format(self.escape(external_id), item_id),
             data,
             http_method="put",
         )
 
+    def update_source_items(self, source_items):
+        """Update the quantities of several products in a single request
+        to the source items API of Magento Inventory (Magento 2.x only)
+
+        :param source_items: list of dicts with the ``sku``, ``source_code``,
+                             ``quantity`` and ``status`` of the products
+        """
+        if self.collection.version == "1.7":
+            raise NotImplementedError
+        return self._call(
+            "inventory/source-items", {"sourceItems": source_items}, http_method="post"
+        )
+
 
 class MagentoBindingProductListener(Component):
     _name = "magento.binding.product.product.listener"
@@ -363,8 +666,33 @@ class MagentoBindingProductListener(Component):
 
     @skip_if(lambda self, record, **kwargs: self.no_connector_export(record))
     def on_record_write(self, record, fields=None):
-        if record.no_stock_sync:
-            return
+        self._export_inventory(record, fields)
+
+    @skip_if(lambda self, records, **kwargs: self.no_connector_export(records))
+    def on_record_write_batch(self, records, fields=None):
+        """Same as ``on_record_write`` for several records written at once"""
+        self._export_inventory(records, fields)
+
+    def _use_bulk_export(self, binding, inventory_fields):
+        backend = binding.backend_id
+        return (
+            inventory_fields == ["magento_qty"]
+            and backend.version == "2.0"
+            and backend.stock_export_mode == "source_items"
+        )
+
+    def _export_inventory(self, records, fields):
+        """Create the inventory export jobs of the records
+
+        The quantities exported in bulk are exported by a single job.
+        """
         inventory_fields = list(set(fields).intersection(self.INVENTORY_FIELDS))
-        if inventory_fields:
-            record.with_delay(priority=20).export_inventory(fields=inventory_fields)
+        if not inventory_fields:
+            return
+        records = records.filtered(lambda binding: not binding.no_stock_sync)
+        bulk = records.filtered(
+            lambda binding: self._use_bulk_export(binding, inventory_fields)
+        )
+        if bulk:
+            bulk.with_delay(priority=20).export_inventory_bulk()
+        (records - bulk)._delay_export_inventory(inventory_fields)
@@ -3,6 +3,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
 import base64
+import hashlib
 import logging
 import sys
 
@@ -14,6 +15,7 @@ from odoo.addons.component.core import Component
 from odoo.addons.connector.components.mapper import mapping, only_create
 from odoo.addons.connector.exception import InvalidDataError, MappingError
 
+from ...components.backend_adapter import DEFAULT_POOL_SIZE, get_session
 from ...components.mapper import normalize_datetime
 
 _logger = logging.getLogger(__name__)
@@ -30,29 +32,28 @@ class ProductBatchImporter(Component):
     _inherit = "magento.delayed.batch.importer"
     _apply_on = ["magento.product.product"]
 
+    _import_chunk_size = 100
+
     def run(self, filters=None):
         """Run the synchronization"""
-        from_date = filters.pop("from_date", None)
-        to_date = filters.pop("to_date", None)
-
         if filters is None:
             filters = {}
-        pagesize = 20
-        current_page = 0
-        while True:
-            filters["pageSize"] = pagesize
-            filters["current_page"] = current_page
+        from_date = filters.pop("from_date", None)
+        to_date = filters.pop("to_date", None)
+        if self.collection.version == "1.7":
             external_ids = self.backend_adapter.search(
                 filters, from_date=from_date, to_date=to_date
             )
             _logger.info(
                 "search for magento products %s returned %s", filters, external_ids
             )
-            if not external_ids:
-                break
             for external_id in external_ids:
                 self._import_record(external_id)
-            current_page += 1
+        else:
+            self._import_pages(
+                self._search_pages(filters, from_date=from_date, to_date=to_date)
+            )
+        self._flush_records()
 
 
 class CatalogImageImporter(Component):
@@ -96,9 +97,30 @@ class CatalogImageImporter(Component):
 
         return sorted(images, key=priority)
 
-    def _get_binary_image(self, image_data):
+    def _get_session(self):
+        """Return the pooled HTTP session used to download the images"""
+        backend = self.backend_record
+        return get_session(
+            "magento.product.image",
+            pool_size=backend.http_pool_size or DEFAULT_POOL_SIZE,
+            max_retries=backend.http_max_retries,
+        )
+
+    def _get_binary_image(self, image_data, etag=None):
+        """Download an image
+
+        When ``etag`` is given, the image is only downloaded if it has
+        been modified, otherwise ``image_data['not_modified']`` is set.
+        The ETag of the downloaded image is stored in
+        ``image_data['etag']``.
+
+        :return: the content of the image, or None when it is missing or
+                 not modified
+        """
         url = image_data["url"]
         headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
         if (
             self.backend_record.auth_basic_username
             and self.backend_record.auth_basic_password
@@ -113,9 +135,12 @@ class CatalogImageImporter(Component):
                 ).encode("utf-8")
             )
             headers["Authorization"] = "Basic %s" % (base64string.decode("utf-8"))
-        request = requests.get(
+        request = self._get_session().get(
             url, headers=headers, verify=self.backend_record.verify_ssl
         )
+        if request.status_code == 304:
+            image_data["not_modified"] = True
+            return
         if request.status_code == 404:
             # the image is just missing, we skip it
             return
@@ -123,21 +148,48 @@ class CatalogImageImporter(Component):
         # image so we propagate the error, the import will fail and we
         # have to check why it couldn't be accessed
         request.raise_for_status()
+        image_data["etag"] = request.headers.get("ETag")
         return request.content
 
     def _write_image_data(self, binding, binary, image_data):
-        binding = binding.with_context(connector_no_export=True)
-        binding.write({"image_1920": base64.b64encode(binary)})
+        """Write the image on the binding, along with the file, checksum and
+        ETag of the image
 
-    def run(self, external_id, binding, data=None):
+        The image itself is not written when its checksum is unchanged, to
+        avoid to resize it again.
+        """
+        binding = binding.with_context(connector_no_export=True)
+        checksum = hashlib.sha1(binary).hexdigest()
+        values = {
+            "magento_image_file": image_data.get("file"),
+            "magento_image_checksum": checksum,
+            "magento_image_etag": image_data.get("etag"),
+        }
+        if checksum != binding.magento_image_checksum:
+            values["image_1920"] = base64.b64encode(binary)
+        binding.write(values)
+
+    def run(self, external_id, binding, data=None, images=None):
+        """Import the image of a record
+
+        :param data: the Magento record, used to find the images with
+                     Magento 2.x
+        :param images: the images of the record, when already known
+        """
         self.external_id = external_id
-        images = self._get_images(data=data)
+        if images is None:
+            images = self._get_images(data=data)
         images = self._sort_images(images)
         binary = None
         image_data = None
         while not binary and images:
             image_data = images.pop()
-            binary = self._get_binary_image(image_data)
+            etag = None
+            if image_data.get("file") == binding.magento_image_file:
+                etag = binding.magento_image_etag
+            binary = self._get_binary_image(image_data, etag=etag)
+            if image_data.get("not_modified"):
+                return
         if not binary:
             return
         self._write_image_data(binding, binary, image_data)
@@ -226,6 +278,14 @@ class ProductImportMapper(Component):
         if self.collection.version == "2.0":
             return {"external_id": record["sku"]}
 
+    @mapping
+    def stock_item_id(self, record):
+        """Magento 2: keep the id of the stock item of the default stock,
+        so the inventory exports do not have to look it up"""
+        stock_item = record.get("extension_attributes", {}).get("stock_item")
+        if stock_item and stock_item.get("stock_id") == 1:
+            return {"magento_stock_item_id": stock_item["item_id"]}
+
     @mapping
     def is_active(self, record):
         """Check if the product is active in Magento
@@ -309,32 +369,29 @@ class ProductImporter(Component):
     def _import_bundle_dependencies(self):
         """Import the dependencies for a Bundle"""
         if self.collection.version == "1.7":
-            for dependency in [
-                selection
+            dependencies = [
+                selection["product_id"]
                 for option in self.magento_record["_bundle_data"]["options"]
                 for selection in option["selections"]
-            ]:
-                self._import_dependency(
-                    dependency["product_id"], "magento.product.product"
-                )
+            ]
         else:
-            for dependency in [
-                product_link
+            dependencies = [
+                product_link["sku"]
                 for option in self.magento_record["extension_attributes"][
                     "bundle_product_options"
                 ]
                 for product_link in option["product_links"]
-            ]:
-                self._import_dependency(dependency["sku"], "magento.product.product")
+            ]
+        self._import_dependencies_many(dependencies, "magento.product.product")
 
     def _import_dependencies(self):
         """Import the dependencies for the record"""
         record = self.magento_record
         # import related categories
-        for mag_category_id in record.get("category_ids") or record.get(
-            "categories", []
-        ):
-            self._import_dependency(mag_category_id, "magento.product.category")
+        self._import_dependencies_many(
+            record.get("category_ids") or record.get("categories", []),
+            "magento.product.category",
+        )
         if record["type_id"] == "bundle":
             self._import_bundle_dependencies()
 
@@ -403,10 +460,24 @@ class ProductImporter(Component):
             usage="translation.importer",
         )
         translation_importer.run(
-            self.external_id, binding, mapper="magento.product.product.import.mapper"
+            self.external_id,
+            binding,
+            mapper="magento.product.product.import.mapper",
+            magento_record=self.magento_record,
+            last_sync_date=self.last_sync_date,
         )
-        image_importer = self.component(usage="product.image.importer")
-        image_importer.run(self.external_id, binding, data=self.magento_record)
+        if self.backend_record.delay_image_import:
+            # the images are downloaded in a separate job, which does not
+            # keep the lock on the product while they are downloaded
+            images = None
+            if self.collection.version == "2.0":
+                images = self.backend_adapter.get_images(
+                    self.external_id, data=self.magento_record
+                )
+            binding.with_delay().import_images(images=images)
+        else:
+            image_importer = self.component(usage="product.image.importer")
+            image_importer.run(self.external_id, binding, data=self.magento_record)
 
         if self.magento_record["type_id"] == "bundle":
             bundle_importer = self.component(usage="product.bundle.importer")
@@ -454,8 +525,76 @@ class ProductInventoryExporter(Component):
             )
         return result
 
+    def _get_source_item(self, binding):
+        """Return the source item of a product for the bulk exports"""
+        return {
+            "sku": self.binder.to_external(binding),
+            "source_code": self.backend_record.stock_source_code or "default",
+            "quantity": binding.magento_qty,
+            "status": int(binding.magento_qty > 0),
+        }
+
+    @staticmethod
+    def _is_refused(err):
+        """Return True if the HTTP error is a refusal of the data sent
+
+        Only the validation errors (400) depend on the products of the
+        request. The other client errors (authentication, permissions,
+        missing endpoint) would fail for any product.
+        """
+        if err.response is not None:
+            status = err.response.status_code
+        else:
+            # errors 400 of the Magento 2 client, see Magento2Client.call
+            status = err.args[1] if len(err.args) > 1 else None
+        return status == 400
+
+    def _export_source_items(self, source_items):
+        """Send source items to Magento, return the ones which failed
+
+        When the data of a request is refused by Magento (400 errors), it is
+        split in two halves which are sent again, until the products which
+        fail are isolated, so the other products of the batch are still
+        exported. The other errors fail the whole export.
+        """
+        try:
+            self.backend_adapter.update_source_items(source_items)
+        except requests.HTTPError as err:
+            if not self._is_refused(err):
+                raise
+            if len(source_items) == 1:
+                _logger.info(
+                    "Bulk stock export of %s failed: %s", source_items[0]["sku"], err
+                )
+                return source_items
+            half = len(source_items) // 2
+            return self._export_source_items(
+                source_items[:half]
+            ) + self._export_source_items(source_items[half:])
+        return []
+
+    def run_bulk(self, bindings):
+        """Export the quantity of several products in a single request
+
+        :return: the bindings which could not be exported
+        """
+        source_items = [self._get_source_item(binding) for binding in bindings]
+        failed_skus = {item["sku"] for item in self._export_source_items(source_items)}
+        return bindings.filtered(
+            lambda binding: self.binder.to_external(binding) in failed_skus
+        )
+
     def run(self, binding, fields):
         """Export the product inventory to Magento"""
         external_id = self.binder.to_external(binding)
         data = self._get_data(binding, fields)
-        self.backend_adapter.update_inventory(external_id, data)
+        if self.collection.version == "1.7":
+            self.backend_adapter.update_inventory(external_id, data)
+            return
+        item_id = self.backend_adapter.update_inventory(
+            external_id, data, item_id=binding.magento_stock_item_id
+        )
+        if item_id != binding.magento_stock_item_id:
+            binding.with_context(connector_no_export=True).write(
+                {"magento_stock_item_id": item_id}
+            )
@@ -5,7 +5,7 @@
 import logging
 import xmlrpc.client
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 from odoo.addons.component.core import Component
 from odoo.addons.connector.exception import IDMissingInBackend
@@ -38,6 +38,25 @@ class MagentoProductCategory(models.Model):
         inverse_name="magento_parent_id",
         string="Magento Child Categories",
     )
+    magento_position = fields.Integer(
+        string="Position on Magento",
+        help="Position of the category among its siblings on Magento.",
+    )
+
+    @api.model
+    def import_tree_nodes(self, backend, external_ids):
+        """Import categories in the given order, chunk by chunk
+
+        The categories are given with the parents before their children.
+        The first chunk is imported and the rest is delayed in a new job,
+        so a category is never imported before its parent.
+        """
+        size = backend.category_tree_chunk_size or len(external_ids)
+        chunk, remaining = external_ids[:size], external_ids[size:]
+        message = self.import_records(backend, chunk, force=True)
+        if remaining:
+            self.with_delay().import_tree_nodes(backend, remaining)
+        return message
 
 
 class ProductCategory(models.Model):
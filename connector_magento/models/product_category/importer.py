@@ -2,10 +2,14 @@
 # © 2016 Sodexis
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
+import logging
+
 from odoo.addons.component.core import Component
 from odoo.addons.connector.components.mapper import mapping
 from odoo.addons.connector.exception import MappingError
 
+_logger = logging.getLogger(__name__)
+
 
 class ProductCategoryBatchImporter(Component):
     """Import the Magento Product Categories.
@@ -23,8 +27,84 @@ class ProductCategoryBatchImporter(Component):
     #     """Delay a job for the import"""
     #     super().with_delay()._import_record(external_id)
 
+    def _iter_tree_nodes(self, tree):
+        """Yield the nodes of a Magento 2 category tree, the parents
+        before their children"""
+        stack = [tree] if isinstance(tree, dict) else list(reversed(tree))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.get("children_data") or []))
+
+    def _get_bound_nodes(self):
+        """Return the parent and the position of the bound categories,
+        by Magento id"""
+        bindings = self.model.with_context(active_test=False).search(
+            [("backend_id", "=", self.backend_record.id)]
+        )
+        return {
+            binding.external_id: (
+                binding.magento_parent_id.external_id or None,
+                binding.magento_position,
+            )
+            for binding in bindings
+        }
+
+    def _get_changed_nodes(self, tree, updated_ids=None):
+        """Return the Magento ids of the categories of the tree to import,
+        the parents before their children
+
+        A category is imported when it is not bound yet, when its parent
+        or its position differ from its binding, or when it has been
+        modified on Magento (``updated_ids``, all of them when None).
+        """
+        bound_nodes = self._get_bound_nodes()
+        changed = []
+        for node in self._iter_tree_nodes(tree):
+            external_id = str(node["id"])
+            parent_id = str(node["parent_id"]) if node.get("parent_id") else None
+            if (
+                updated_ids is None
+                or external_id in updated_ids
+                or bound_nodes.get(external_id)
+                != (parent_id, node.get("position") or 0)
+            ):
+                changed.append(external_id)
+        return changed
+
+    def _run_tree_sync(self, filters):
+        """Import the changed categories of the tree (Magento 2.x)
+
+        The tree is read at once and compared with the bindings, only the
+        changed categories are imported, in one job per chunk. As the
+        parents are imported first, the importers find them already bound
+        instead of reading them again.
+        """
+        from_date = filters.pop("from_date", None)
+        to_date = filters.pop("to_date", None)
+        updated_ids = None
+        if from_date or to_date:
+            updated_ids = {
+                str(external_id)
+                for external_id in self.backend_adapter.search(
+                    filters, from_date=from_date, to_date=to_date
+                )
+            }
+        tree = self.backend_adapter.tree()
+        external_ids = self._get_changed_nodes(tree, updated_ids)
+        _logger.info(
+            "%d product categories to import from the tree of backend %s",
+            len(external_ids),
+            self.backend_record.name,
+        )
+        if external_ids:
+            self.model.with_delay().import_tree_nodes(self.backend_record, external_ids)
+
     def run(self, filters=None):
         """Run the synchronization"""
+        if self.collection.version == "2.0" and self.backend_record.category_tree_sync:
+            return self._run_tree_sync(filters)
+
         # if self.collection.version == "2.0":
         #     # TODO. See 8.0 version
         #     raise NotImplementedError
@@ -61,6 +141,7 @@ class ProductCategoryBatchImporter(Component):
 
         base_priority = 10
         import_nodes(tree)
+        self._flush_records()
 
 
 class ProductCategoryImporter(Component):
@@ -82,7 +163,12 @@ class ProductCategoryImporter(Component):
     def _after_import(self, binding):
         """Hook called at the end of the import"""
         translation_importer = self.component(usage="translation.importer")
-        translation_importer.run(self.external_id, binding)
+        translation_importer.run(
+            self.external_id,
+            binding,
+            magento_record=self.magento_record,
+            last_sync_date=self.last_sync_date,
+        )
 
 
 class ProductCategoryImportMapper(Component):
@@ -92,6 +178,7 @@ class ProductCategoryImportMapper(Component):
 
     direct = [
         ("description", "description"),
+        ("position", "magento_position"),
     ]
 
     @mapping
@@ -0,0 +1,28 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+from odoo import api, models
+
+
+class ProductPricelist(models.Model):
+    _inherit = "product.pricelist"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # invalidate the pricelists cached by
+        # magento.backend._lookup_reference
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        # the first pricelist found depends on the sequence
+        if {"currency_id", "active", "company_id", "sequence"} & set(vals):
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
@@ -251,14 +251,10 @@ class SaleOrderAdapter(Component):
             else:
                 raise
 
-    def search(
+    def _search_filters(
         self, filters=None, from_date=None, to_date=None, magento_storeview_ids=None
     ):
-        """Search records according to some criteria
-        and returns a list of ids
-
-        :rtype: list
-        """
+        """Add the creation dates and storeviews to the search filters"""
         if filters is None:
             filters = {}
         dt_fmt = MAGENTO_DATETIME_FORMAT
@@ -270,7 +266,27 @@ class SaleOrderAdapter(Component):
             filters["created_at"]["to"] = to_date.strftime(dt_fmt)
         if magento_storeview_ids is not None:
             filters["store_id"] = {"in": magento_storeview_ids}
+        return filters
+
+    def search(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_storeview_ids=None,
+        **kwargs
+    ):
+        """Search records according to some criteria
+        and returns a list of ids
 
+        :rtype: list
+        """
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_storeview_ids=magento_storeview_ids,
+        )
         if self.collection.version == "1.7":
             arguments = {
                 "imported": False,
@@ -279,7 +295,45 @@ class SaleOrderAdapter(Component):
             }
         else:
             arguments = filters
-        return super().search(arguments)
+        return super().search(arguments, **kwargs)
+
+    def search_read(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_storeview_ids=None,
+        **kwargs
+    ):
+        """Search records according to some criteria
+        and returns their information
+
+        :rtype: list
+        """
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_storeview_ids=magento_storeview_ids,
+        )
+        return super().search_read(filters=filters, **kwargs)
+
+    def search_pages(
+        self,
+        filters=None,
+        from_date=None,
+        to_date=None,
+        magento_storeview_ids=None,
+        **kwargs
+    ):
+        """Search records page by page"""
+        filters = self._search_filters(
+            filters,
+            from_date=from_date,
+            to_date=to_date,
+            magento_storeview_ids=magento_storeview_ids,
+        )
+        return super().search_pages(filters=filters, **kwargs)
 
     def read(self, external_id, attributes=None):
         """Returns the information of a record
@@ -295,7 +349,7 @@ class SaleOrderAdapter(Component):
 
     def get_parent(self, external_id):
         if self.collection.version == "2.0":
-            res = self.read(external_id)
+            res = self.read(external_id, attributes=["relation_parent_id"])
             return res.get("relation_parent_id")
         return self._call("%s.get_parent" % self._magento_model, [external_id])
 
@@ -22,6 +22,8 @@ class SaleOrderBatchImporter(Component):
     _inherit = "magento.delayed.batch.importer"
     _apply_on = "magento.sale.order"
 
+    _import_chunk_size = 20
+
     # def _import_record(self, external_id, **kwargs):
     #     return super()._import_record(
     #         external_id, job_options=job_options
@@ -35,11 +37,7 @@ class SaleOrderBatchImporter(Component):
         from_date = filters.pop("from_date", None)
         to_date = filters.pop("to_date", None)
         magento_storeview_ids = [filters.pop("magento_storeview_id")]
-        pagesize = 20
-        current_page = 0
-        while True:
-            filters["pageSize"] = pagesize
-            filters["current_page"] = current_page
+        if self.collection.version == "1.7":
             external_ids = self.backend_adapter.search(
                 filters,
                 from_date=from_date,
@@ -49,11 +47,18 @@ class SaleOrderBatchImporter(Component):
             _logger.info(
                 "search for magento saleorders %s returned %s", filters, external_ids
             )
-            if not external_ids:
-                break
             for external_id in external_ids:
                 self._import_record(external_id)
-            current_page += 1
+        else:
+            self._import_pages(
+                self._search_pages(
+                    filters,
+                    from_date=from_date,
+                    to_date=to_date,
+                    magento_storeview_ids=magento_storeview_ids,
+                )
+            )
+        self._flush_records()
 
 
 class SaleImportRule(Component):
@@ -123,9 +128,8 @@ class SaleImportRule(Component):
         :rtype: boolean
         """
         payment_method = record["payment"]["method"]
-        method = self.env["account.payment.mode"].search(
-            [("name", "=", payment_method)],
-            limit=1,
+        method = self.backend_record._lookup_reference(
+            "account.payment.mode", [("name", "=", payment_method)]
         )
         if not method:
             raise FailedJobError(
@@ -300,8 +304,8 @@ class SaleOrderImportMapper(Component):
             record["customer_id"], unwrap=True
         )
         if partner.property_product_pricelist.currency_id.name != currency:
-            pricelist = self.env["product.pricelist"].search(
-                [("currency_id.name", "=", currency)], limit=1
+            pricelist = self.backend_record._lookup_reference(
+                "product.pricelist", [("currency_id.name", "=", currency)]
             )
             if not pricelist:
                 raise FailedJobError(
@@ -312,9 +316,8 @@ class SaleOrderImportMapper(Component):
     @mapping
     def payment(self, record):
         record_method = record["payment"]["method"]
-        method = self.env["account.payment.mode"].search(
-            [["name", "=", record_method]],
-            limit=1,
+        method = self.backend_record._lookup_reference(
+            "account.payment.mode", [("name", "=", record_method)]
         )
         assert method, (
             "method %s should exist because the import fails "
@@ -333,9 +336,8 @@ class SaleOrderImportMapper(Component):
         if not ifield:
             return
 
-        carrier = self.env["delivery.carrier"].search(
-            [("magento_code", "=", ifield)],
-            limit=1,
+        carrier = self.backend_record._lookup_reference(
+            "delivery.carrier", [("magento_code", "=", ifield)]
         )
         if carrier:
             result = {"carrier_id": carrier.id}
@@ -478,6 +480,23 @@ class SaleOrderImporter(Component):
         rules = self.component(usage="sale.import.rule")
         rules.check(self.magento_record)
 
+    def _get_parent_bindings(self, parent_id):
+        """Return the bindings of the chain of parent orders, the nearest
+        first, empty for the parents which are not imported
+
+        A parent already linked to its own parent ends the chain, as the
+        import of this parent has linked the rest of the chain. Magento
+        is only asked for the parent of the other orders.
+        """
+        parent_bindings = []
+        while parent_id:
+            parent_binding = self.binder.to_internal(parent_id)
+            parent_bindings.append(parent_binding)
+            if parent_binding.magento_parent_id:
+                break
+            parent_id = self.backend_adapter.get_parent(parent_id)
+        return parent_bindings
+
     def _link_parent_orders(self, binding):
         """Link the magento.sale.order to its parent orders.
 
@@ -495,13 +514,8 @@ class SaleOrderImporter(Component):
             parent_id = self.magento_record.get("relation_parent_real_id")
         if not parent_id:
             return
-        all_parent_ids = []
-        while parent_id:
-            all_parent_ids.append(parent_id)
-            parent_id = self.backend_adapter.get_parent(parent_id)
         current_binding = binding
-        for parent_id in all_parent_ids:
-            parent_binding = self.binder.to_internal(parent_id)
+        for parent_binding in self._get_parent_bindings(parent_id):
             if not parent_binding:
                 # may happen if several sales orders have been
                 # edited / canceled but not all have been imported
@@ -530,9 +544,9 @@ class SaleOrderImporter(Component):
         # (http://www.magentocommerce.com/bug-tracking/issue?issue=15886)
         return storeview_binder.to_internal(record["store_id"])
 
-    def _get_magento_data(self):
-        """Return the raw Magento data for ``self.external_id``"""
-        record = super()._get_magento_data()
+    def _prepare_magento_data(self, record):
+        """Fix the raw Magento data of the sales order"""
+        record = super()._prepare_magento_data(record)
         # sometimes we don't have website_id...
         # we fix the record!
         if not record.get("website_id"):
@@ -739,14 +753,16 @@ class SaleOrderImporter(Component):
 
         self._import_addresses()
 
-        for line in record.get("items", []):
-            _logger.debug("line: %s", line)
-            if "product_id" in line:
-                if self.collection.version == "1.7":
-                    key = "product_id"
-                else:
-                    key = "sku"
-                self._import_dependency(line[key], "magento.product.product")
+        if self.collection.version == "1.7":
+            key = "product_id"
+        else:
+            key = "sku"
+        # the products of all the lines are searched at once, the mapper
+        # of the lines finds them in the binding cache
+        self._import_dependencies_many(
+            [line[key] for line in record.get("items", []) if "product_id" in line],
+            "magento.product.product",
+        )
 
 
 class SaleOrderLineImportMapper(Component):
@@ -40,7 +40,7 @@ class MagentoPickingExporter(Component):
         """
         item_qty = {}
         # get product and quantities to ship from the picking
-        for line in binding.move_lines:
+        for line in binding.move_ids:
             sale_line = line.sale_line_id
             if not sale_line.magento_bind_ids:
                 continue
@@ -58,7 +58,7 @@ class MockResponseImage(object):
 
 @contextmanager
 def mock_urlopen_image():
-    with mock.patch("requests.get") as requests_get:
+    with mock.patch("requests.Session.get") as requests_get:
         requests_get.return_value = MockResponseImage("")
         yield
 
@@ -10,3 +10,8 @@ from . import test_magento2_import_product_category
 from . import test_magento2_import_product_image
 from . import test_magento2_related_action
 from . import test_magento2_sale_order
+from . import test_magento2_client
+from . import test_magento2_batch_import
+from . import test_magento2_translation_import
+from . import test_magento2_fake_server
+from . import test_magento2_benchmark
@@ -0,0 +1,1055 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+"""
+Fake Magento 2 REST server
+==========================
+
+A stand-in for the REST API of Magento 2 serving synthetic websites,
+storeviews, categories, products, customers and orders, to run the
+imports and exports against realistic volumes without a Magento instance.
+
+Only the standard library is used, so the server can be started from a
+test::
+
+    with FakeMagento2Server(FakeMagentoData(products=5000)) as server:
+        backend.location = server.url
+
+or from the command line::
+
+    python fake_magento.py --products 50000 --orders 5000 --port 8080
+
+The resources implement the ``searchCriteria`` filters, sort orders and
+paging, the ``fields`` projection, the stock items, the source items and
+the ship and invoice endpoints. A latency and random errors can be added
+to every request.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote_plus, urlsplit
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOCALES = ("en_US", "fr_FR", "nl_NL", "de_DE")
+
+FILTER_RE = re.compile(
+    r"searchCriteria\[filter_groups\]\[(\d+)\]\[filters\]\[(\d+)\]\[(\w+)\]"
+)
+SORT_RE = re.compile(r"searchCriteria\[sortOrders\]\[(\d+)\]\[(\w+)\]")
+PATH_RE = re.compile(r"^(?:/index\.php)?/rest(?:/(?P<store>[\w-]+))?/V1/(?P<path>.*)$")
+
+
+class MagentoError(Exception):
+    """Error returned by the fake server as a Magento error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def parse_fields(spec):
+    """Parse a ``fields`` parameter to a nested dict
+
+    ``items[id,extension_attributes[stock_item[qty]]],total_count`` gives
+    ``{"items": {"id": None, "extension_attributes": {"stock_item":
+    {"qty": None}}}, "total_count": None}``.
+    """
+    position = 0
+
+    def parse():
+        nonlocal position
+        result = {}
+        name = ""
+        while position < len(spec):
+            char = spec[position]
+            position += 1
+            if char == "[":
+                result[name.strip()] = parse()
+                name = ""
+            elif char == ",":
+                if name.strip():
+                    result[name.strip()] = None
+                name = ""
+            elif char == "]":
+                break
+            else:
+                name += char
+        if name.strip():
+            result[name.strip()] = None
+        return result
+
+    return parse()
+
+
+def apply_fields(value, selection):
+    """Keep only the selected fields of a response"""
+    if selection is None:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(item, selection) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: apply_fields(value[key], sub_selection)
+            for key, sub_selection in selection.items()
+            if key in value
+        }
+    return value
+
+
+def _coerce(value, like):
+    """Convert a filter value received as string to the type of ``like``"""
+    if isinstance(like, bool):
+        return value in ("1", "true", True)
+    if isinstance(like, (int, float)):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+def _match(record_value, condition, value):
+    if condition == "null":
+        return record_value is None
+    if condition == "notnull":
+        return record_value is not None
+    if record_value is None:
+        return False
+    if condition in ("in", "nin"):
+        values = [_coerce(item, record_value) for item in str(value).split(",")]
+        return (record_value in values) == (condition == "in")
+    if condition == "finset":
+        return str(value) in str(record_value).split(",")
+    if condition == "like":
+        pattern = re.escape(str(value)).replace("%", ".*").replace("_", ".")
+        return re.fullmatch(pattern, str(record_value), re.IGNORECASE) is not None
+    value = _coerce(value, record_value)
+    try:
+        if condition == "eq":
+            return record_value == value
+        if condition == "neq":
+            return record_value != value
+        if condition == "gt":
+            return record_value > value
+        if condition in ("gteq", "from", "moreq"):
+            return record_value >= value
+        if condition == "lt":
+            return record_value < value
+        if condition in ("lteq", "to"):
+            return record_value <= value
+    except TypeError:
+        return False
+    raise MagentoError(400, '"%s" is not a valid condition type.' % condition)
+
+
+def search(records, params, columns=None):
+    """Apply the ``searchCriteria`` of the query to a list of records
+
+    The filter groups are joined with AND, the filters of a group with OR.
+    Both ``currentPage`` and ``current_page`` are accepted for the page.
+    ``columns`` maps the fields of the criteria to the keys of the records
+    when they differ, a field mapped to None is refused as by Magento.
+    """
+    columns = columns or {}
+
+    def column(field):
+        if columns.get(field, field) is None:
+            raise MagentoError(400, 'Column "%s" does not exist.' % field)
+        return columns.get(field, field)
+
+    groups = {}
+    sort_orders = {}
+    page_size = current_page = None
+    for key, value in params.items():
+        filter_match = FILTER_RE.fullmatch(key)
+        sort_match = SORT_RE.fullmatch(key)
+        if filter_match:
+            group, index, attribute = filter_match.groups()
+            groups.setdefault(group, {}).setdefault(index, {})[attribute] = value
+        elif sort_match:
+            index, attribute = sort_match.groups()
+            sort_orders.setdefault(int(index), {})[attribute] = value
+        elif key == "searchCriteria[pageSize]":
+            page_size = int(value)
+        elif key in ("searchCriteria[currentPage]", "searchCriteria[current_page]"):
+            current_page = int(value)
+    for group in groups.values():
+        filters = list(group.values())
+        records = [
+            record
+            for record in records
+            if any(
+                _match(
+                    record.get(column(item["field"])),
+                    item.get("condition_type", "eq"),
+                    item.get("value"),
+                )
+                for item in filters
+            )
+        ]
+    for index in sorted(sort_orders, reverse=True):
+        order = sort_orders[index]
+        field = column(order["field"])
+        records = sorted(
+            records,
+            key=lambda record, field=field: (
+                record.get(field) is None,
+                record.get(field),
+            ),
+            reverse=order.get("direction", "ASC").upper() == "DESC",
+        )
+    total_count = len(records)
+    if page_size:
+        start = ((current_page or 1) - 1) * page_size
+        records = records[start : start + page_size]
+    criteria = {"filter_groups": []}
+    if page_size:
+        criteria.update(page_size=page_size, current_page=current_page or 1)
+    return {
+        "items": records,
+        "search_criteria": criteria,
+        "total_count": total_count,
+    }
+
+
+class FakeMagentoData(object):
+    """Synthetic data set of a Magento 2 instance
+
+    The data is generated from ``seed``, so the same arguments always
+    give the same records.
+    """
+
+    def __init__(
+        self,
+        websites=1,
+        storeviews=2,
+        categories=20,
+        products=100,
+        customers=20,
+        orders=20,
+        seed=0,
+    ):
+        self.random = random.Random(seed)
+        self.base_url = "http://magento/"
+        self.start_date = datetime(2026, 1, 1)
+        self.lock = threading.Lock()
+        self.websites = []
+        self.store_groups = []
+        self.store_views = []
+        self.categories = {}
+        self.products = {}
+        self.customers = {}
+        self.customer_groups = {}
+        self.orders = {}
+        self.shipments = {}
+        self.invoices = {}
+        self.tracks = {}
+        self._generate_stores(websites, storeviews)
+        self._generate_categories(categories)
+        self._generate_products(products)
+        self._generate_customers(customers)
+        self._generate_orders(orders)
+
+    def _date(self, index):
+        return (self.start_date + timedelta(minutes=index)).strftime(DATETIME_FORMAT)
+
+    def _generate_stores(self, websites, storeviews):
+        self.websites.append(
+            {"id": 0, "code": "admin", "name": "Admin", "default_group_id": 0}
+        )
+        self.store_groups.append(
+            {
+                "id": 0,
+                "website_id": 0,
+                "root_category_id": 0,
+                "default_store_id": 0,
+                "name": "Default",
+                "code": "default",
+            }
+        )
+        self.store_views.append(
+            {
+                "id": 0,
+                "code": "admin",
+                "name": "Admin",
+                "website_id": 0,
+                "store_group_id": 0,
+                "is_active": 1,
+            }
+        )
+        storeview_id = 0
+        for website_id in range(1, websites + 1):
+            self.websites.append(
+                {
+                    "id": website_id,
+                    "code": "base" if website_id == 1 else "website_%d" % website_id,
+                    "name": "Website %d" % website_id,
+                    "default_group_id": website_id,
+                }
+            )
+            self.store_groups.append(
+                {
+                    "id": website_id,
+                    "website_id": website_id,
+                    "root_category_id": 2,
+                    "default_store_id": storeview_id + 1,
+                    "name": "Store %d" % website_id,
+                    "code": "store_%d" % website_id,
+                }
+            )
+            for __ in range(storeviews):
+                storeview_id += 1
+                self.store_views.append(
+                    {
+                        "id": storeview_id,
+                        "code": "default"
+                        if storeview_id == 1
+                        else "storeview_%d" % storeview_id,
+                        "name": "Storeview %d" % storeview_id,
+                        "website_id": website_id,
+                        "store_group_id": website_id,
+                        "is_active": 1,
+                    }
+                )
+
+    def store_configs(self):
+        return [
+            {
+                "id": storeview["id"],
+                "code": storeview["code"],
+                "website_id": storeview["website_id"],
+                "locale": LOCALES[(storeview["id"] - 1) % len(LOCALES)],
+                "base_currency_code": "USD",
+                "default_display_currency_code": "USD",
+                "timezone": "Europe/Amsterdam",
+                "weight_unit": "lbs",
+                "base_url": self.base_url,
+                "base_link_url": self.base_url + "index.php/",
+                "base_media_url": self.base_url + "media/",
+                "secure_base_url": self.base_url,
+                "secure_base_link_url": self.base_url + "index.php/",
+                "secure_base_media_url": self.base_url + "media/",
+            }
+            for storeview in self.store_views
+            if storeview["id"]
+        ]
+
+    def _generate_categories(self, count):
+        self.categories[1] = {
+            "id": 1,
+            "parent_id": 0,
+            "name": "Root Catalog",
+            "level": 0,
+            "path": "1",
+        }
+        self.categories[2] = {
+            "id": 2,
+            "parent_id": 1,
+            "name": "Default Category",
+            "level": 1,
+            "path": "1/2",
+        }
+        for category_id in range(3, count + 3):
+            parent = self.categories[self.random.randint(2, category_id - 1)]
+            self.categories[category_id] = {
+                "id": category_id,
+                "parent_id": parent["id"],
+                "name": "Category %d" % category_id,
+                "level": parent["level"] + 1,
+                "path": "%s/%d" % (parent["path"], category_id),
+            }
+        for position, category in enumerate(self.categories.values()):
+            children = [
+                str(child["id"])
+                for child in self.categories.values()
+                if child["parent_id"] == category["id"]
+            ]
+            category.update(
+                {
+                    "is_active": True,
+                    "position": position,
+                    "children": ",".join(children),
+                    "created_at": self._date(category["id"]),
+                    "updated_at": self._date(category["id"]),
+                    "available_sort_by": [],
+                    "include_in_menu": True,
+                    "custom_attributes": [
+                        {
+                            "attribute_code": "url_key",
+                            "value": "category-%d" % position,
+                        },
+                        {"attribute_code": "children_count", "value": len(children)},
+                    ],
+                }
+            )
+
+    def category_tree(self, category_id=1):
+        category = self.categories[category_id]
+        children = [
+            self.category_tree(int(child_id))
+            for child_id in category["children"].split(",")
+            if child_id
+        ]
+        return {
+            "id": category["id"],
+            "parent_id": category["parent_id"],
+            "name": category["name"],
+            "is_active": category["is_active"],
+            "position": category["position"],
+            "level": category["level"],
+            "product_count": 0,
+            "children_data": children,
+        }
+
+    def _generate_products(self, count):
+        category_ids = [
+            category_id for category_id in self.categories if category_id > 2
+        ]
+        website_ids = [website["id"] for website in self.websites if website["id"]]
+        for product_id in range(1, count + 1):
+            sku = "SKU-%06d" % product_id
+            qty = self.random.randint(0, 200)
+            categories = self.random.sample(
+                category_ids, min(len(category_ids), self.random.randint(1, 3))
+            )
+            self.products[sku] = {
+                "id": product_id,
+                "sku": sku,
+                "name": "Product %d" % product_id,
+                "attribute_set_id": 4,
+                "price": round(self.random.uniform(1, 500), 2),
+                "status": 1,
+                "visibility": 4,
+                "type_id": "simple",
+                "weight": 1,
+                "created_at": self._date(product_id),
+                "updated_at": self._date(product_id),
+                "extension_attributes": {
+                    "website_ids": website_ids,
+                    "category_links": [
+                        {"position": 0, "category_id": str(category_id)}
+                        for category_id in categories
+                    ],
+                    "stock_item": {
+                        "item_id": product_id,
+                        "product_id": product_id,
+                        "stock_id": 1,
+                        "qty": qty,
+                        "is_in_stock": qty > 0,
+                        "is_qty_decimal": False,
+                        "use_config_min_qty": True,
+                        "min_qty": 0,
+                        "use_config_backorders": True,
+                        "backorders": 0,
+                        "use_config_manage_stock": True,
+                        "manage_stock": True,
+                    },
+                },
+                "product_links": [],
+                "options": [],
+                "media_gallery_entries": [],
+                "tier_prices": [],
+                "custom_attributes": [
+                    {"attribute_code": "url_key", "value": "product-%d" % product_id},
+                    {"attribute_code": "tax_class_id", "value": "2"},
+                    {
+                        "attribute_code": "description",
+                        "value": "<p>Description of product %d</p>" % product_id,
+                    },
+                    {
+                        "attribute_code": "category_ids",
+                        "value": [str(category_id) for category_id in categories],
+                    },
+                ],
+            }
+
+    def product_by_id(self, product_id):
+        return next(
+            product for product in self.products.values() if product["id"] == product_id
+        )
+
+    def _address(self, index, customer_id=None):
+        address = {
+            "region": {"region_code": "TX", "region": "Texas", "region_id": 57},
+            "region_id": 57,
+            "country_id": "US",
+            "street": ["%d Main Street" % index],
+            "telephone": "555-%04d" % index,
+            "postcode": "%05d" % (75000 + index % 1000),
+            "city": "Dallas",
+            "firstname": "First%d" % index,
+            "lastname": "Last%d" % index,
+        }
+        if customer_id:
+            address.update(
+                {
+                    "id": index,
+                    "customer_id": customer_id,
+                    "default_shipping": True,
+                    "default_billing": True,
+                }
+            )
+        return address
+
+    def _generate_customers(self, count):
+        for group_id, code in enumerate(
+            ("NOT LOGGED IN", "General", "Wholesale", "Retailer")
+        ):
+            self.customer_groups[group_id] = {
+                "id": group_id,
+                "code": code,
+                "tax_class_id": 3,
+                "tax_class_name": "Retail Customer",
+            }
+        for customer_id in range(1, count + 1):
+            self.customers[customer_id] = {
+                "id": customer_id,
+                "group_id": 1,
+                "default_billing": str(customer_id),
+                "default_shipping": str(customer_id),
+                "created_at": self._date(customer_id),
+                "updated_at": self._date(customer_id),
+                "created_in": "Storeview 1",
+                "email": "customer%d@example.com" % customer_id,
+                "firstname": "First%d" % customer_id,
+                "lastname": "Last%d" % customer_id,
+                "gender": 0,
+                "store_id": 1,
+                "website_id": 1,
+                "addresses": [self._address(customer_id, customer_id)],
+                "disable_auto_group_change": 0,
+                "extension_attributes": {"is_subscribed": False},
+            }
+
+    def _generate_orders(self, count):
+        skus = list(self.products)
+        item_id = 0
+        for order_id in range(1, count + 1):
+            customer = self.customers.get(
+                self.random.randint(1, len(self.customers) or 1)
+            )
+            items = []
+            for sku in self.random.sample(
+                skus, min(len(skus), self.random.randint(1, 3))
+            ):
+                item_id += 1
+                product = self.products[sku]
+                qty = self.random.randint(1, 3)
+                items.append(
+                    {
+                        "item_id": item_id,
+                        "order_id": order_id,
+                        "sku": sku,
+                        "name": product["name"],
+                        "product_id": product["id"],
+                        "product_type": "simple",
+                        "qty_ordered": qty,
+                        "qty_shipped": 0,
+                        "qty_invoiced": 0,
+                        "qty_canceled": 0,
+                        "price": product["price"],
+                        "base_price": product["price"],
+                        "price_incl_tax": product["price"],
+                        "original_price": product["price"],
+                        "row_total": product["price"] * qty,
+                        "base_row_total": product["price"] * qty,
+                        "row_total_incl_tax": product["price"] * qty,
+                        "base_row_total_incl_tax": product["price"] * qty,
+                        "base_discount_amount": 0,
+                        "tax_amount": 0,
+                        "tax_percent": 0,
+                        "discount_amount": 0,
+                        "discount_percent": 0,
+                        "is_virtual": 0,
+                        "store_id": 1,
+                        "weight": 1,
+                        "created_at": self._date(order_id),
+                        "updated_at": self._date(order_id),
+                    }
+                )
+            subtotal = round(sum(item["row_total"] for item in items), 2)
+            address = self._address(order_id)
+            address.update(
+                {
+                    "entity_id": order_id * 2,
+                    "parent_id": order_id,
+                    "address_type": "billing",
+                    "email": customer["email"]
+                    if customer
+                    else "guest%d@example.com" % order_id,
+                    "customer_address_id": customer["id"] if customer else None,
+                }
+            )
+            shipping_address = dict(
+                address, entity_id=order_id * 2 + 1, address_type="shipping"
+            )
+            self.orders[order_id] = {
+                "entity_id": order_id,
+                "increment_id": "%09d" % order_id,
+                "created_at": self._date(order_id),
+                "updated_at": self._date(order_id),
+                "state": "new",
+                "status": "pending",
+                "store_id": 1,
+                "store_name": "Website 1\nStore 1\nStoreview 1",
+                "customer_id": customer["id"] if customer else None,
+                "customer_is_guest": 0 if customer else 1,
+                "customer_group_id": 1 if customer else 0,
+                "customer_email": address["email"],
+                "customer_firstname": address["firstname"],
+                "customer_lastname": address["lastname"],
+                "base_currency_code": "USD",
+                "order_currency_code": "USD",
+                "subtotal": subtotal,
+                "base_subtotal": subtotal,
+                "shipping_amount": 5,
+                "base_shipping_amount": 5,
+                "shipping_incl_tax": 5,
+                "shipping_description": "Flat Rate - Fixed",
+                "discount_amount": 0,
+                "tax_amount": 0,
+                "grand_total": subtotal + 5,
+                "base_grand_total": subtotal + 5,
+                "total_item_count": len(items),
+                "items": items,
+                "billing_address": address,
+                "payment": {"method": "checkmo", "amount_ordered": subtotal + 5},
+                "status_histories": [],
+                "extension_attributes": {
+                    "shipping_assignments": [
+                        {
+                            "shipping": {
+                                "address": shipping_address,
+                                "method": "flatrate_flatrate",
+                            },
+                            "items": items,
+                        }
+                    ]
+                },
+            }
+
+    def _order_item_quantities(self, order, arguments, field):
+        """Check the quantities of a shipment or an invoice of an order"""
+        items = {item["item_id"]: item for item in order["items"]}
+        lines = arguments.get("items") or [
+            {"order_item_id": item_id, "qty": item["qty_ordered"] - item[field]}
+            for item_id, item in items.items()
+        ]
+        quantities = {}
+        for line in lines:
+            item_id = int(line.get("order_item_id") or line.get("orderItemId"))
+            item = items.get(item_id)
+            if item is None or line["qty"] > item["qty_ordered"] - item[field]:
+                raise MagentoError(
+                    400, "The quantity of the order item %s is invalid." % item_id
+                )
+            quantities[item_id] = line["qty"]
+        return items, quantities
+
+    def ship(self, order_id, arguments):
+        with self.lock:
+            order = self.orders[order_id]
+            items, quantities = self._order_item_quantities(
+                order, arguments, "qty_shipped"
+            )
+            for item_id, qty in quantities.items():
+                items[item_id]["qty_shipped"] += qty
+            shipment_id = len(self.shipments) + 1
+            self.shipments[shipment_id] = {
+                "entity_id": shipment_id,
+                "order_id": order_id,
+                "items": quantities,
+            }
+            order["state"] = order["status"] = "processing"
+            return shipment_id
+
+    def invoice(self, order_id, arguments):
+        with self.lock:
+            order = self.orders[order_id]
+            items, quantities = self._order_item_quantities(
+                order, arguments, "qty_invoiced"
+            )
+            for item_id, qty in quantities.items():
+                items[item_id]["qty_invoiced"] += qty
+            invoice_id = len(self.invoices) + 1
+            self.invoices[invoice_id] = {
+                "entity_id": invoice_id,
+                "order_id": order_id,
+                "items": quantities,
+            }
+            return invoice_id
+
+    def track(self, arguments):
+        with self.lock:
+            track_id = len(self.tracks) + 1
+            self.tracks[track_id] = dict(arguments.get("entity") or {})
+            return track_id
+
+    def update_stock_item(self, sku, item_id, arguments):
+        product = self.products.get(sku)
+        if product is None:
+            raise MagentoError(404, "The product that was requested doesn't exist.")
+        stock_item = product["extension_attributes"]["stock_item"]
+        if item_id != stock_item["item_id"]:
+            raise MagentoError(
+                404, 'The stock item with "%s" ID wasn\'t found.' % item_id
+            )
+        values = arguments.get("stockItem") or {}
+        with self.lock:
+            for field in ("qty", "is_in_stock", "manage_stock", "backorders"):
+                if field in values:
+                    stock_item[field] = values[field]
+            for field in ("use_config_manage_stock", "use_config_backorders"):
+                if field in values:
+                    stock_item[field] = bool(values[field])
+        return stock_item["item_id"]
+
+    def update_source_items(self, arguments):
+        source_items = arguments.get("sourceItems") or []
+        unknown = [
+            item.get("sku")
+            for item in source_items
+            if item.get("sku") not in self.products
+        ]
+        if unknown:
+            raise MagentoError(400, "Products not found: %s" % ", ".join(unknown))
+        with self.lock:
+            for item in source_items:
+                stock_item = self.products[item["sku"]]["extension_attributes"][
+                    "stock_item"
+                ]
+                stock_item["qty"] = item["quantity"]
+                stock_item["is_in_stock"] = bool(item.get("status"))
+        return []
+
+    def update_order(self, arguments):
+        entity = arguments.get("entity") or {}
+        order = self.orders.get(int(entity.get("entity_id") or 0))
+        if order is None:
+            raise MagentoError(404, "The entity that was requested doesn't exist.")
+        with self.lock:
+            for field in ("state", "status"):
+                if entity.get(field):
+                    order[field] = entity[field]
+        return order
+
+    def add_order_comment(self, order_id, arguments):
+        with self.lock:
+            self.orders[order_id]["status_histories"].append(
+                dict(arguments.get("statusHistory") or {})
+            )
+        return True
+
+
+class FakeMagento2Handler(BaseHTTPRequestHandler):
+    """Request handler of :class:`FakeMagento2Server`"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        server = self.server
+        server.count_request(method, self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            server.wait()
+            server.inject_error()
+            token = server.token
+            if token and self.headers.get("Authorization") != "Bearer %s" % token:
+                raise MagentoError(
+                    401, "The consumer isn't authorized to access %resources."
+                )
+            url = urlsplit(self.path)
+            match = PATH_RE.match(url.path)
+            if not match:
+                raise MagentoError(404, "Request does not match any route.")
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            arguments = json.loads(body) if body else {}
+            path = unquote_plus(match.group("path")).strip("/")
+            result = server.route(method, path, params, arguments)
+            if "fields" in params:
+                result = apply_fields(result, parse_fields(params["fields"]))
+            self._respond(200, result)
+        except MagentoError as err:
+            self._respond(err.status, {"message": err.message})
+
+    def _respond(self, status, result):
+        content = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeMagento2Server(ThreadingHTTPServer):
+    """Fake Magento 2 REST server serving a :class:`FakeMagentoData`
+
+    :param data: data set, a small one is generated by default
+    :param latency: seconds added to each request
+    :param jitter: maximum random seconds added to the latency
+    :param error_rate: probability (0 to 1) of an injected error
+    :param error_status: HTTP status of the injected errors
+    :param token: token expected in the ``Authorization`` header, not
+                  checked when empty
+    :param port: 0 to use a free port
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        data=None,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        token=None,
+        host="127.0.0.1",
+        port=0,
+    ):
+        super().__init__((host, port), FakeMagento2Handler)
+        self.data = data or FakeMagentoData()
+        self.data.base_url = self.url + "/"
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token = token
+        self.request_count = 0
+        self.requests = {}
+        self._random = random.Random()
+        self._counter_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return "http://%s:%s" % (host, port)
+
+    def start(self):
+        """Serve the requests in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def count_request(self, method, path):
+        """Count the requests per method and resource"""
+        key = (method, PATH_RE.sub(r"\g<path>", urlsplit(path).path))
+        with self._counter_lock:
+            self.request_count += 1
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def wait(self):
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def inject_error(self):
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise MagentoError(self.error_status, "Injected error")
+
+    # (HTTP method, resource path, name of the method returning the result)
+    ROUTES = [
+        ("GET", r"store/websites", "_get_websites"),
+        ("GET", r"store/storeGroups", "_get_store_groups"),
+        ("GET", r"store/storeViews", "_get_store_views"),
+        ("GET", r"store/storeConfigs", "_get_store_configs"),
+        ("GET", r"categories", "_get_category_tree"),
+        ("GET", r"categories/list", "_search_categories"),
+        ("GET", r"categories/(?P<id>\d+)", "_get_category"),
+        ("GET", r"products", "_search_products"),
+        ("GET", r"products/(?P<sku>[^/]+)", "_get_product"),
+        ("GET", r"stockItems/(?P<sku>[^/]+)", "_get_stock_item"),
+        ("PUT", r"products/(?P<sku>[^/]+)/stockItems/(?P<id>\d+)", "_put_stock_item"),
+        ("POST", r"inventory/source-items", "_post_source_items"),
+        ("GET", r"customers/search", "_search_customers"),
+        ("GET", r"customers/(?P<id>\d+)", "_get_customer"),
+        ("GET", r"customerGroups/search", "_search_customer_groups"),
+        ("GET", r"customerGroups/(?P<id>\d+)", "_get_customer_group"),
+        ("GET", r"orders", "_search_orders"),
+        ("GET", r"orders/(?P<id>\d+)", "_get_order"),
+        ("POST", r"orders", "_post_order"),
+        ("POST", r"orders/(?P<id>\d+)/comments", "_post_order_comment"),
+        ("POST", r"order/(?P<id>\d+)/ship", "_post_ship"),
+        ("POST", r"order/(?P<id>\d+)/invoice", "_post_invoice"),
+        ("POST", r"shipment/track", "_post_track"),
+    ]
+
+    def route(self, method, path, params, arguments):
+        """Return the result of a request on a resource path"""
+        for route_method, pattern, name in self.ROUTES:
+            if route_method != method:
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                return getattr(self, name)(params, arguments, **match.groupdict())
+        raise MagentoError(404, "Request does not match any route.")
+
+    def _get_websites(self, params, arguments):
+        return self.data.websites
+
+    def _get_store_groups(self, params, arguments):
+        return self.data.store_groups
+
+    def _get_store_views(self, params, arguments):
+        return self.data.store_views
+
+    def _get_store_configs(self, params, arguments):
+        return self.data.store_configs()
+
+    def _get_category_tree(self, params, arguments):
+        return self.data.category_tree()
+
+    def _search_categories(self, params, arguments):
+        return search(list(self.data.categories.values()), params)
+
+    def _get_category(self, params, arguments, id):
+        return self._get(self.data.categories, int(id), "category")
+
+    def _search_products(self, params, arguments):
+        # the products are searched on their entity_id, returned with an id
+        return search(
+            list(self.data.products.values()),
+            params,
+            columns={"entity_id": "id", "id": None},
+        )
+
+    def _get_product(self, params, arguments, sku):
+        return self._get(self.data.products, sku, "product")
+
+    def _get_stock_item(self, params, arguments, sku):
+        product = self._get(self.data.products, sku, "product")
+        return product["extension_attributes"]["stock_item"]
+
+    def _put_stock_item(self, params, arguments, sku, id):
+        return self.data.update_stock_item(sku, int(id), arguments)
+
+    def _post_source_items(self, params, arguments):
+        return self.data.update_source_items(arguments)
+
+    def _search_customers(self, params, arguments):
+        return search(list(self.data.customers.values()), params)
+
+    def _get_customer(self, params, arguments, id):
+        return self._get(self.data.customers, int(id), "customer")
+
+    def _search_customer_groups(self, params, arguments):
+        return search(list(self.data.customer_groups.values()), params)
+
+    def _get_customer_group(self, params, arguments, id):
+        return self._get(self.data.customer_groups, int(id), "group")
+
+    def _search_orders(self, params, arguments):
+        return search(list(self.data.orders.values()), params)
+
+    def _get_order(self, params, arguments, id):
+        return self._get(self.data.orders, int(id), "order")
+
+    def _post_order(self, params, arguments):
+        return self.data.update_order(arguments)
+
+    def _post_order_comment(self, params, arguments, id):
+        self._get_order(params, arguments, id)
+        return self.data.add_order_comment(int(id), arguments)
+
+    def _post_ship(self, params, arguments, id):
+        self._get_order(params, arguments, id)
+        return self.data.ship(int(id), arguments)
+
+    def _post_invoice(self, params, arguments, id):
+        self._get_order(params, arguments, id)
+        return self.data.invoice(int(id), arguments)
+
+    def _post_track(self, params, arguments):
+        return self.data.track(arguments)
+
+    @staticmethod
+    def _get(records, key, name):
+        record = records.get(key)
+        if record is None:
+            raise MagentoError(404, "The %s that was requested doesn't exist." % name)
+        return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--websites", type=int, default=1)
+    parser.add_argument("--storeviews", type=int, default=2)
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--token")
+    args = parser.parse_args()
+    data = FakeMagentoData(
+        websites=args.websites,
+        storeviews=args.storeviews,
+        categories=args.categories,
+        products=args.products,
+        customers=args.customers,
+        orders=args.orders,
+        seed=args.seed,
+    )
+    server = FakeMagento2Server(
+        data,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token=args.token,
+        host=args.host,
+        port=args.port,
+    )
+    print("Fake Magento 2 listening on %s" % server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
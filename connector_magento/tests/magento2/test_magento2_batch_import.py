@@ -0,0 +1,252 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+import threading
+
+import mock
+
+from odoo.addons.component.core import Component, WorkContext
+from odoo.addons.component.tests.common import TransactionComponentRegistryCase
+
+from ... import components
+from ...models.product.common import ProductProductAdapter
+from ...models.product.importer import ProductBatchImporter
+
+PRODUCTS = [
+    {"sku": "MH09-L-Blue", "type_id": "simple", "name": "Abominable Hoodie"},
+    {"sku": "MH09-L-Green", "type_id": "simple", "name": "Abominable Hoodie"},
+]
+
+
+class StubMagentoAPI(object):
+    """Return pages of ``total`` products of the REST API
+
+    The pages are selected by their number or, when the search is sorted,
+    by the ``gt`` filter on the id.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+        self.threads = set()
+        self.api = self
+
+    def call(self, method, arguments, http_method=None, storeview=None):
+        self.calls.append((method, dict(arguments)))
+        self.threads.add(threading.current_thread().name)
+        page_size = arguments["searchCriteria[pageSize]"]
+        if "searchCriteria[sortOrders][0][field]" in arguments:
+            first = 0
+            expr = "searchCriteria[filter_groups][%d][filters][0][%s]"
+            group = 0
+            while expr % (group, "field") in arguments:
+                if arguments[expr % (group, "condition_type")] == "gt":
+                    # ids start at 1
+                    first = arguments[expr % (group, "value")]
+                group += 1
+        else:
+            page = arguments["searchCriteria[current_page]"]
+            first = (page - 1) * page_size
+        last = min(first + page_size, self.total)
+        return {
+            "items": [
+                {"id": index + 1, "sku": "SKU%d" % index}
+                for index in range(first, last)
+            ],
+            "total_count": self.total,
+        }
+
+
+class TestBatchImport(TransactionComponentRegistryCase):
+    """Test the batch importers of Magento 2"""
+
+    def setUp(self):
+        super().setUp()
+        warehouse = self.env.ref("stock.warehouse0")
+        self.backend = self.env["magento.backend"].create(
+            {
+                "name": "Test Magento",
+                "version": "2.0",
+                "location": "http://magento",
+                "warehouse_id": warehouse.id,
+                "token": "odoo42",
+            }
+        )
+
+        class StubProductAdapter(Component):
+            _name = "stub.product.adapter"
+            _collection = "magento.backend"
+            _usage = "backend.adapter"
+            _apply_on = "magento.product.product"
+
+            _magento2_key = "sku"
+
+            def search_pages(self, filters=None, read=False, **kwargs):
+                yield PRODUCTS if read else [record["sku"] for record in PRODUCTS]
+                yield []
+
+        self._build_components(
+            StubProductAdapter,
+            components.core.BaseMagentoConnectorComponent,
+            components.importer.BatchImporter,
+            components.importer.DelayedBatchImporter,
+            ProductBatchImporter,
+        )
+        self.work = WorkContext(
+            model_name="magento.product.product",
+            collection=self.backend,
+            components_registry=self.comp_registry,
+        )
+
+    def _run_batch(self, chunk_size=None):
+        importer = self.work.component(usage="batch.importer")
+        if chunk_size is not None:
+            importer._import_chunk_size = chunk_size
+        with mock.patch(
+            "odoo.addons.queue_job.models.base.DelayableRecordset",
+            name="DelayableRecordset",
+            spec=True,
+        ) as delayable_cls:
+            delayable = mock.MagicMock(name="DelayableBinding")
+            delayable_cls.return_value = delayable
+            importer.run(filters={})
+        return delayable
+
+    def test_batch_import_ids(self):
+        """By default, only the ids are searched"""
+        delayable = self._run_batch(chunk_size=1)
+        self.assertEqual(
+            delayable.import_record.call_args_list,
+            [
+                mock.call(self.backend, "MH09-L-Blue"),
+                mock.call(self.backend, "MH09-L-Green"),
+            ],
+        )
+
+    def test_batch_import_full_records(self):
+        """The records read by the search are given to the record import"""
+        self.backend.batch_import_full_records = True
+        delayable = self._run_batch(chunk_size=1)
+        self.assertEqual(
+            delayable.import_record.call_args_list,
+            [
+                mock.call(self.backend, "MH09-L-Blue", data=PRODUCTS[0]),
+                mock.call(self.backend, "MH09-L-Green", data=PRODUCTS[1]),
+            ],
+        )
+
+    def test_batch_import_chunks(self):
+        """One job is created for each chunk of records"""
+        delayable = self._run_batch(chunk_size=100)
+        delayable.import_record.assert_not_called()
+        delayable.import_records.assert_called_once_with(
+            self.backend, ["MH09-L-Blue", "MH09-L-Green"]
+        )
+
+    def test_batch_import_chunks_backend(self):
+        """The size of the chunks set on the backend has precedence"""
+        self.backend.import_chunk_size = 1
+        delayable = self._run_batch(chunk_size=100)
+        delayable.import_records.assert_not_called()
+        self.assertEqual(delayable.import_record.call_count, 2)
+
+    def test_batch_import_chunks_full_records(self):
+        """The records are split in chunks along with their data"""
+        self.backend.batch_import_full_records = True
+        delayable = self._run_batch(chunk_size=2)
+        delayable.import_records.assert_called_once_with(
+            self.backend, ["MH09-L-Blue", "MH09-L-Green"], records=PRODUCTS
+        )
+
+
+class TestSearchPages(TransactionComponentRegistryCase):
+    """Test the paged searches of the Magento 2 adapters"""
+
+    def setUp(self):
+        super().setUp()
+        warehouse = self.env.ref("stock.warehouse0")
+        self.backend = self.env["magento.backend"].create(
+            {
+                "name": "Test Magento",
+                "version": "2.0",
+                "location": "http://magento",
+                "warehouse_id": warehouse.id,
+                "token": "odoo42",
+            }
+        )
+        self._build_components(
+            components.core.BaseMagentoConnectorComponent,
+            components.backend_adapter.MagentoCRUDAdapter,
+            components.backend_adapter.GenericAdapter,
+            ProductProductAdapter,
+        )
+
+    def _get_adapter(self, magento_api):
+        work = WorkContext(
+            model_name="magento.product.product",
+            collection=self.backend,
+            components_registry=self.comp_registry,
+            magento_api=magento_api,
+        )
+        return work.component(usage="backend.adapter")
+
+    def test_search_pages_total_count(self):
+        """The pages are known from the total count, no empty page is read"""
+        magento_api = StubMagentoAPI(total=45)
+        adapter = self._get_adapter(magento_api)
+        pages = list(adapter.search_pages({}, page_size=20))
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(pages[2][-1], "SKU44")
+        self.assertEqual(len(magento_api.calls), 3)
+        self.assertEqual(magento_api.calls[0][1]["fields"], "items[sku],total_count")
+
+    def test_search_pages_parallel(self):
+        """The pages following the first one are fetched concurrently"""
+        magento_api = StubMagentoAPI(total=100)
+        adapter = self._get_adapter(magento_api)
+        pages = list(adapter.search_pages({}, page_size=10, max_workers=4))
+        skus = [sku for page in pages for sku in page]
+        self.assertEqual(skus, ["SKU%d" % index for index in range(100)])
+        self.assertEqual(len(magento_api.calls), 10)
+        self.assertGreater(len(magento_api.threads), 1)
+
+    def test_search_pages_parallel_window(self):
+        """The pages are not fetched further ahead than the workers"""
+        magento_api = StubMagentoAPI(total=100)
+        adapter = self._get_adapter(magento_api)
+        pages = adapter.search_pages({}, page_size=10, max_workers=4)
+        next(pages)
+        next(pages)
+        # the first page, the 4 pages fetched ahead and the next one
+        self.assertLessEqual(len(magento_api.calls), 6)
+        pages.close()
+
+    def test_search_pages_cursor(self):
+        """The cursor pages are sorted and filtered on the last entity id"""
+        magento_api = StubMagentoAPI(total=45)
+        adapter = self._get_adapter(magento_api)
+        pages = list(adapter.search_pages({}, page_size=20, cursor=True))
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(pages[2][-1], "SKU44")
+        self.assertEqual(len(magento_api.calls), 3)
+        params = magento_api.calls[0][1]
+        self.assertEqual(params["fields"], "items[id,sku]")
+        self.assertEqual(params["searchCriteria[sortOrders][0][field]"], "entity_id")
+        self.assertEqual(params["searchCriteria[sortOrders][0][direction]"], "ASC")
+        self.assertNotIn("searchCriteria[current_page]", params)
+        params = magento_api.calls[2][1]
+        self.assertEqual(
+            params["searchCriteria[filter_groups][0][filters][0][field]"],
+            "entity_id",
+        )
+        self.assertEqual(
+            params["searchCriteria[filter_groups][0][filters][0][value]"], 40
+        )
+
+    def test_search_cursor(self):
+        """The cursor search returns all the ids, ending on an empty page"""
+        magento_api = StubMagentoAPI(total=40)
+        adapter = self._get_adapter(magento_api)
+        skus = adapter.search({}, cursor=True, page_size=20)
+        self.assertEqual(skus, ["SKU%d" % index for index in range(40)])
+        self.assertEqual(len(magento_api.calls), 3)
@@ -0,0 +1,179 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+"""
+Throughput benchmarks of the importers and exporters
+
+The benchmarks run the synchronizations against the fake Magento 2 server
+(see :mod:`.fake_magento`) and are excluded from the standard test runs.
+Run them with ``--test-tags magento_benchmark``. The environment variables
+are:
+
+* ``MAGENTO_BENCHMARK_RECORDS``: number of records of each pipeline
+* ``MAGENTO_BENCHMARK_UPDATE_BASELINE``: store the results as the new
+  baseline instead of comparing them with it
+
+For each pipeline, the records per second, the calls to Magento and the
+SQL queries per record and the peak of memory allocated by Python are
+reported and compared with ``fixtures/benchmark_baseline.json``. A metric
+which is worse than the baseline by more than its tolerance fails the
+test. The baseline has to be recorded on the machine running the
+benchmarks.
+"""
+
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from os.path import dirname, exists, join
+
+from odoo.tests import tagged
+
+from .common import Magento2TestCase
+from .fake_magento import FakeMagento2Server, FakeMagentoData
+
+_logger = logging.getLogger(__name__)
+
+BASELINE_PATH = join(dirname(__file__), "fixtures", "benchmark_baseline.json")
+
+# relative degradation accepted for each metric, and whether a higher
+# value is better
+METRICS = {
+    "records_per_second": (0.3, True),
+    "calls_per_record": (0.0, False),
+    "queries_per_record": (0.1, False),
+    "peak_memory_kb": (0.3, False),
+}
+
+
+@tagged("-standard", "-at_install", "post_install", "magento_benchmark")
+class TestMagento2Benchmark(Magento2TestCase):
+    """Benchmark the synchronizations of N records of each kind"""
+
+    def setUp(self):
+        super().setUp()
+        self.count = int(os.environ.get("MAGENTO_BENCHMARK_RECORDS") or 50)
+        self.data = FakeMagentoData(
+            products=self.count, customers=self.count, orders=self.count
+        )
+        self.server = FakeMagento2Server(self.data, token=self.backend.token)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.backend.location = self.server.url
+        self.backend.synchronize_metadata()
+        self.results = {}
+
+    @contextmanager
+    def measure(self, name, count):
+        """Measure the synchronization of ``count`` records"""
+        cr = self.env.cr
+        calls = self.server.request_count
+        queries = cr.sql_log_count
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+            self.env.flush_all()
+            duration = time.perf_counter() - start
+            __, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.results[name] = {
+            "records_per_second": round(count / duration, 2),
+            "calls_per_record": round((self.server.request_count - calls) / count, 2),
+            "queries_per_record": round((cr.sql_log_count - queries) / count, 2),
+            "peak_memory_kb": round(peak / 1024),
+        }
+
+    def _import(self, model_name, external_ids):
+        for external_id in external_ids:
+            self.env[model_name].import_record(self.backend, external_id)
+
+    def _report(self):
+        lines = ["Magento benchmark, %d records per pipeline:" % self.count]
+        for name, result in self.results.items():
+            lines.append(
+                "%-20s %s"
+                % (
+                    name,
+                    ", ".join(
+                        "%s: %s" % (metric, value) for metric, value in result.items()
+                    ),
+                )
+            )
+        _logger.info("\n".join(lines))
+
+    def _compare_baseline(self):
+        """Return the metrics worse than the baseline"""
+        if os.environ.get("MAGENTO_BENCHMARK_UPDATE_BASELINE"):
+            with open(BASELINE_PATH, "w") as baseline_file:
+                json.dump(self.results, baseline_file, indent=4, sort_keys=True)
+            return []
+        if not exists(BASELINE_PATH):
+            _logger.warning("No benchmark baseline in %s", BASELINE_PATH)
+            return []
+        with open(BASELINE_PATH) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = []
+        for name, result in self.results.items():
+            for metric, value in result.items():
+                reference = baseline.get(name, {}).get(metric)
+                if reference is None:
+                    continue
+                tolerance, higher_is_better = METRICS[metric]
+                if higher_is_better:
+                    regressed = value < reference * (1 - tolerance)
+                else:
+                    regressed = value > reference * (1 + tolerance)
+                if regressed:
+                    regressions.append(
+                        "%s %s: %s (baseline %s)" % (name, metric, value, reference)
+                    )
+        return regressions
+
+    def test_benchmark(self):
+        count = self.count
+        with self.measure("product_import", count):
+            self._import("magento.product.product", list(self.data.products))
+        with self.measure("partner_import", count):
+            self._import("magento.res.partner", list(self.data.customers))
+        with self.measure("sale_order_import", count):
+            self._import("magento.sale.order", list(self.data.orders))
+
+        products = self.env["magento.product.product"].search(
+            [("backend_id", "=", self.backend.id)]
+        )
+        with self.measure("inventory_export", len(products)):
+            for binding in products:
+                binding.export_inventory(
+                    fields=["magento_qty", "manage_stock", "backorders"]
+                )
+
+        orders = self.env["magento.sale.order"].search(
+            [("backend_id", "=", self.backend.id)]
+        )
+        pickings = self.env["magento.stock.picking"]
+        with self.mock_with_delay():
+            for order in orders:
+                order.odoo_id.action_confirm()
+                for picking in order.picking_ids:
+                    pickings |= self.create_binding_no_export(
+                        "magento.stock.picking",
+                        picking,
+                        magento_order_id=order.id,
+                        picking_method="complete",
+                    )
+        with self.measure("picking_export", len(pickings)):
+            for binding in pickings:
+                binding.export_picking_done(with_tracking=False)
+
+        self.assertEqual(len(products), count)
+        self.assertEqual(len(orders), count)
+        self.assertEqual(len(self.data.shipments), len(pickings))
+        self._report()
+        regressions = self._compare_baseline()
+        self.assertFalse(
+            regressions, "Performance regressions:\n%s" % "\n".join(regressions)
+        )
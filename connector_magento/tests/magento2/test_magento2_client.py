@@ -0,0 +1,141 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+import mock
+
+from ...components.backend_adapter import (
+    CallMetrics,
+    api_metrics,
+    resource_path_template,
+)
+from .common import Magento2SyncTestCase, recorder
+
+
+class TestMagento2Client(Magento2SyncTestCase):
+    """Test the HTTP sessions of the Magento 2 REST client"""
+
+    def _get_client(self):
+        with self.backend.work_on("magento.website") as work:
+            return work.magento_api.api
+
+    def test_session_shared_between_sync_sessions(self):
+        """The connections are kept from one work session to the next"""
+        client1 = self._get_client()
+        client2 = self._get_client()
+        self.assertIsNot(client1, client2)
+        self.assertIs(client1.session, client2.session)
+
+    def test_session_pool_size(self):
+        self.backend.http_pool_size = 3
+        session = self._get_client().session
+        adapter = session.get_adapter(self.backend.location)
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(adapter.max_retries.total, self.backend.http_max_retries)
+
+    def test_connection_stats(self):
+        client = self._get_client()
+        stats_before = client.connection_stats()
+        with recorder.use_cassette("metadata"):
+            self.backend.synchronize_metadata()
+        stats = client.connection_stats()
+        self.assertEqual(set(stats), {"requests", "connections", "reused"})
+        self.assertGreater(stats["requests"], stats_before["requests"])
+        self.assertEqual(stats["reused"], stats["requests"] - stats["connections"])
+
+    def test_resource_path_template(self):
+        self.assertEqual(
+            resource_path_template("products/MH09-L-Blue/stockItems/190"),
+            "products/{id}/stockItems/{id}",
+        )
+        self.assertEqual(resource_path_template("store/storeViews"), "store/storeViews")
+
+    def test_call_metrics_percentiles(self):
+        metrics = CallMetrics(sample_size=1000)
+        key = (1, "products", "GET")
+        for index in range(1, 101):
+            metrics.record(key, index / 1000.0, error=index > 98, size=10)
+        result = metrics.pop()[key]
+        self.assertEqual(result["count"], 100)
+        self.assertEqual(result["errors"], 2)
+        self.assertEqual(result["bytes"], 1000)
+        self.assertEqual(result["p50"], 0.05)
+        self.assertEqual(result["p95"], 0.095)
+        self.assertEqual(result["p99"], 0.099)
+        self.assertEqual(result["max"], 0.1)
+        self.assertEqual(metrics.pop(), {})
+
+    def test_api_metrics_flushed(self):
+        """The metrics of the calls are stored on the backend"""
+        api_metrics.pop()
+        self.backend.collect_api_metrics = True
+        with recorder.use_cassette("metadata"):
+            self.backend.synchronize_metadata()
+        self.env["magento.api.metric"]._flush_metrics(force=True)
+        metric = self.backend.api_metric_ids.filtered(
+            lambda metric: metric.path == "store/storeViews"
+        )
+        self.assertEqual(metric.http_method, "GET")
+        self.assertEqual(metric.count, 1)
+        self.assertFalse(metric.error_count)
+        self.assertGreater(metric.bytes, 0)
+        self.assertGreaterEqual(metric.latency_p99, metric.latency_p50)
+
+    def test_api_metrics_flushed_on_error(self):
+        """The metrics of a failed sync session are stored as well"""
+        api_metrics.pop()
+        self.backend.collect_api_metrics = True
+        # the metrics of a failed session are written with a new cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        with mock.patch.object(api_metrics, "flush_due", return_value=True):
+            with self.assertRaises(ValueError):
+                with self.backend.work_on("magento.website"):
+                    api_metrics.record(
+                        (self.backend.id, "store/websites", "GET"), 0.1, error=True
+                    )
+                    raise ValueError
+        metric = self.backend.api_metric_ids.filtered(
+            lambda metric: metric.path == "store/websites"
+        )
+        self.assertEqual(metric.count, 1)
+        self.assertEqual(metric.error_count, 1)
+
+    def test_lookup_cache(self):
+        """The reference records are cached until they are modified"""
+        api_metrics.pop_lookups()
+        self.env["magento.backend"].clear_caches()
+        self.backend.collect_api_metrics = True
+        mode = self.env["account.payment.mode"].search([("name", "=", "checkmo")])
+        domain = [("name", "=", "checkmo")]
+        for __ in range(3):
+            self.assertEqual(
+                self.backend._lookup_reference("account.payment.mode", domain), mode
+            )
+        mode.name = "Check / Money order"
+        self.assertFalse(self.backend._lookup_reference("account.payment.mode", domain))
+        self.env["magento.api.metric"]._flush_metrics(force=True)
+        metric = self.backend.api_metric_ids.filtered(
+            lambda metric: metric.path == "account.payment.mode"
+        )
+        self.assertEqual(metric.http_method, "lookup")
+        self.assertEqual(metric.count, 4)
+        self.assertEqual(metric.cache_hits, 2)
+        self.assertEqual(metric.cache_hit_rate, 50.0)
+
+    def test_lookup_cache_pricelist_sequence(self):
+        """The first pricelist found follows the changes of sequence"""
+        self.env["magento.backend"].clear_caches()
+        pricelists = self.env["product.pricelist"].create(
+            [
+                {"name": "Magento Lookup %d" % index, "sequence": 100 + index}
+                for index in range(2)
+            ]
+        )
+        domain = [("name", "=like", "Magento Lookup %")]
+        self.assertEqual(
+            self.backend._lookup_reference("product.pricelist", domain), pricelists[0]
+        )
+        pricelists[1].sequence = 1
+        self.assertEqual(
+            self.backend._lookup_reference("product.pricelist", domain), pricelists[1]
+        )
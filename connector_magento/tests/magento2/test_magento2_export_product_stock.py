@@ -4,6 +4,12 @@
 
 import json
 
+import mock
+import requests
+
+from odoo import fields
+
+from ...components.backend_adapter import MagentoAPI
 from .common import Magento2SyncTestCase, recorder
 
 
@@ -131,12 +137,54 @@ class TestUpdateStockQty(Magento2SyncTestCase):
             # call the job directly
             binding.export_inventory(fields=["magento_qty"])
 
-            self.assertEqual(2, len(cassette.requests))
+            # the stock item id is known since the import of the product
+            self.assertEqual(binding.magento_stock_item_id, 190)
+            self.assertEqual(1, len(cassette.requests))
             self.assertEqual(
-                json.loads(cassette.requests[1].body.decode("utf-8")),
+                json.loads(cassette.requests[0].body.decode("utf-8")),
                 {"stockItem": {"qty": 30.0, "is_in_stock": 1}},
             )
 
+    def test_export_qty_api_lookup_stock_item(self):
+        """The stock item id is looked up and stored when unknown"""
+        binding = self.binding_product
+        binding.magento_stock_item_id = 0
+        with self.mock_with_delay():
+            binding.magento_qty = 30
+        with recorder.use_cassette("test_product_export_qty") as cassette:
+            binding.export_inventory(fields=["magento_qty"])
+            # 1. Get stockItems
+            # 2. Put stockItem for default location
+            self.assertEqual(2, len(cassette.requests))
+        self.assertEqual(binding.magento_stock_item_id, 190)
+
+    def test_export_qty_api_stock_item_not_found(self):
+        """The stock item id is looked up again when it does not exist"""
+        binding = self.binding_product
+        calls = []
+
+        def call(method, arguments, http_method=None, storeview=None):
+            calls.append((http_method, method))
+            if method == "products/MH09-L-Blue/stockItems/190":
+                response = requests.Response()
+                response.status_code = 404
+                raise requests.HTTPError("Not Found", response=response)
+            if method == "stockItems/MH09-L-Blue":
+                return {"item_id": 191, "stock_id": 1}
+            return True
+
+        with mock.patch.object(MagentoAPI, "call", side_effect=call):
+            binding.export_inventory(fields=["magento_qty"])
+        self.assertEqual(
+            calls,
+            [
+                ("put", "products/MH09-L-Blue/stockItems/190"),
+                (None, "stockItems/MH09-L-Blue"),
+                ("put", "products/MH09-L-Blue/stockItems/191"),
+            ],
+        )
+        self.assertEqual(binding.magento_stock_item_id, 191)
+
     def test_export_product_inventory_write(self):
         with self.mock_with_delay() as (delayable_cls, delayable):
             self.binding_product.write(
@@ -174,15 +222,15 @@ class TestUpdateStockQty(Magento2SyncTestCase):
                 fields=["backorders", "magento_qty", "manage_stock"]
             )
 
-            # 1. Get stockItems
-            # 2. Put stockItem for default location
-            self.assertEqual(2, len(cassette.requests))
+            # Put stockItem for default location, its id is known since
+            # the import of the product
+            self.assertEqual(1, len(cassette.requests))
 
             # Here we check what call with which args has been done by the
             # BackendAdapter towards Magento to export the new stock
             # values
             self.assertEqual(
-                json.loads(cassette.requests[1].body.decode("utf-8")),
+                json.loads(cassette.requests[0].body.decode("utf-8")),
                 {
                     "stockItem": {
                         "qty": 333.0,
@@ -228,3 +276,186 @@ class TestUpdateStockQty(Magento2SyncTestCase):
             self.assertEqual(20, delay_kwargs.get("priority"))
 
             delayable.export_inventory.assert_called_with(fields=["magento_qty"])
+
+    def test_export_product_inventory_write_bulk(self):
+        """In bulk mode, the quantities are exported by a bulk job"""
+        self.backend.stock_export_mode = "source_items"
+        with self.mock_with_delay() as (delayable_cls, delayable):
+            self.binding_product.write({"magento_qty": 333})
+            self.binding_product.write({"manage_stock": "yes"})
+            delayable.export_inventory_bulk.assert_called_once_with()
+            delayable.export_inventory.assert_called_once_with(fields=["manage_stock"])
+
+    def test_export_qty_bulk(self):
+        """The products refused by Magento are isolated and retried alone"""
+        self.backend.write(
+            {"stock_export_mode": "source_items", "stock_export_batch_size": 4}
+        )
+        bindings = self.binding_product
+        for index, xmlid in enumerate(
+            ["product_product_8", "product_product_9", "product_product_10"]
+        ):
+            bindings |= self.create_binding_no_export(
+                "magento.product.product",
+                self.env.ref("product.%s" % xmlid),
+                "SKU%d" % index,
+                magento_qty=index,
+            )
+        requests_skus = []
+
+        def call(method, arguments, http_method=None, storeview=None):
+            self.assertEqual(method, "inventory/source-items")
+            self.assertEqual(http_method, "post")
+            skus = [item["sku"] for item in arguments["sourceItems"]]
+            requests_skus.append(skus)
+            if "SKU1" in skus:
+                raise requests.HTTPError(method, 400, b"{}", {}, __name__)
+            return []
+
+        with mock.patch.object(MagentoAPI, "call", side_effect=call):
+            with self.mock_with_delay() as (delayable_cls, delayable):
+                bindings.export_inventory_bulk()
+                self.assertEqual(
+                    requests_skus,
+                    [
+                        ["MH09-L-Blue", "SKU0", "SKU1", "SKU2"],
+                        ["MH09-L-Blue", "SKU0"],
+                        ["SKU1", "SKU2"],
+                        ["SKU1"],
+                        ["SKU2"],
+                    ],
+                )
+                self.assertEqual(1, delayable_cls.call_count)
+                delay_args, __ = delayable_cls.call_args
+                self.assertEqual(delay_args[0].external_id, "SKU1")
+                delayable.export_inventory.assert_called_once_with(
+                    fields=["magento_qty"]
+                )
+
+    def test_compute_new_qty_batch(self):
+        """The products are written by quantity, with a single event"""
+        self.backend.stock_export_mode = "source_items"
+        bindings = self.binding_product
+        for index, xmlid in enumerate(
+            ["product_product_8", "product_product_9", "product_product_10"]
+        ):
+            product = self.env.ref("product.%s" % xmlid)
+            product.type = "product"
+            bindings |= self.create_binding_no_export(
+                "magento.product.product", product, "SKU%d" % index
+            )
+            self._product_change_qty(product, 10 if index else 20)
+        self._product_change_qty(self.binding_product.odoo_id, 10)
+        with self.mock_with_delay() as (delayable_cls, delayable):
+            bindings.recompute_magento_qty()
+            self.assertEqual(1, delayable_cls.call_count)
+            delay_args, __ = delayable_cls.call_args
+            self.assertEqual(delay_args[0], bindings)
+            delayable.export_inventory_bulk.assert_called_once_with()
+        self.assertEqual(bindings.mapped("magento_qty"), [10.0, 20.0, 10.0, 10.0])
+
+    def test_export_inventory_coalesced(self):
+        """A product has a single pending inventory export job"""
+        self.binding_product.write({"magento_qty": 333})
+        self.binding_product.write({"magento_qty": 334})
+        self.binding_product.write({"manage_stock": "yes"})
+        jobs = self.env["queue.job"].search(
+            [
+                ("model_name", "=", "magento.product.product"),
+                ("method_name", "=", "export_inventory"),
+            ]
+        )
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs.kwargs, {"fields": ["magento_qty", "manage_stock"]})
+        self.assertEqual(jobs.records, self.binding_product)
+        jobs.state = "done"
+        self.binding_product.write({"magento_qty": 335})
+        jobs = self.env["queue.job"].search(
+            [
+                ("model_name", "=", "magento.product.product"),
+                ("method_name", "=", "export_inventory"),
+                ("state", "=", "pending"),
+            ]
+        )
+        self.assertEqual(jobs.kwargs, {"fields": ["magento_qty"]})
+
+    def test_export_inventory_enqueued(self):
+        """An enqueued inventory export job is not modified"""
+        self.binding_product.write({"magento_qty": 333})
+        job_domain = [
+            ("model_name", "=", "magento.product.product"),
+            ("method_name", "=", "export_inventory"),
+        ]
+        enqueued_job = self.env["queue.job"].search(job_domain)
+        enqueued_job.state = "enqueued"
+        self.binding_product.write({"manage_stock": "yes"})
+        self.binding_product.write({"backorders": "yes"})
+        self.assertEqual(enqueued_job.kwargs, {"fields": ["magento_qty"]})
+        job = self.env["queue.job"].search(job_domain) - enqueued_job
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(job.kwargs, {"fields": ["backorders", "manage_stock"]})
+
+    def test_update_product_stock_qty_incremental(self):
+        """Only the products with stock changes are recomputed"""
+        other_binding = self.create_binding_no_export(
+            "magento.product.product", self.env.ref("product.product_product_8"), "SKU0"
+        )
+        self.env.flush_all()
+        for table in ("magento_product_product", "stock_move", "stock_quant"):
+            self.env.cr.execute(
+                "UPDATE %s SET create_date = '2000-01-01', write_date = '2000-01-01'"
+                % table
+            )
+        self.env.invalidate_all()
+        self.backend.write(
+            {
+                "incremental_stock_update": True,
+                "stock_updated_until": "2000-01-02 00:00:00",
+            }
+        )
+        self._product_change_qty(self.binding_product.odoo_id, 30)
+        product_model = type(self.env["magento.product.product"])
+        with mock.patch.object(
+            product_model, "recompute_magento_qty", autospec=True
+        ) as recompute:
+            self.backend.update_product_stock_qty()
+            recompute.assert_called_once()
+            self.assertEqual(recompute.call_args[0][0], self.binding_product)
+        self.assertGreater(
+            self.backend.stock_updated_until, fields.Datetime.to_datetime("2000-01-02")
+        )
+        # without watermark, all the products are recomputed
+        self.backend.stock_updated_until = False
+        with mock.patch.object(
+            product_model, "recompute_magento_qty", autospec=True
+        ) as recompute:
+            self.backend.update_product_stock_qty()
+            self.assertIn(other_binding, recompute.call_args[0][0])
+
+    def test_aggregated_stock_qty(self):
+        """The aggregated quantities are the quantities of the products"""
+        product = self.binding_product.odoo_id
+        location = self.backend.warehouse_id.lot_stock_id
+        self._product_change_qty(product, 30)
+        move = self.env["stock.move"].create(
+            {
+                "name": "Delivery",
+                "product_id": product.id,
+                "product_uom": product.uom_id.id,
+                "product_uom_qty": 12,
+                "location_id": location.id,
+                "location_dest_id": self.env.ref("stock.stock_location_customers").id,
+            }
+        )
+        move._action_confirm()
+        product = product.with_context(location=location.id)
+        for stock_field in ("qty_available", "virtual_available"):
+            self.assertEqual(
+                self.binding_product._get_aggregated_stock_qty(location, stock_field),
+                {self.binding_product.id: product[stock_field]},
+            )
+        self.assertEqual(product.virtual_available, 18.0)
+        self.backend.aggregate_stock_qty = True
+        with self.mock_with_delay():
+            self.binding_product.recompute_magento_qty()
+        self.assertEqual(self.binding_product.magento_qty, 18.0)
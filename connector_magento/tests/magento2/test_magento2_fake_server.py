@@ -0,0 +1,235 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+import mock
+import requests
+
+from odoo.addons.component.core import Component
+from odoo.addons.component.tests.common import TransactionComponentRegistryCase
+from odoo.addons.connector.exception import IDMissingInBackend
+
+from ... import components
+from ...models.product.common import ProductProductAdapter
+from .common import Magento2TestCase
+from .fake_magento import FakeMagento2Server, FakeMagentoData
+
+
+class TestFakeMagento2Server(Magento2TestCase):
+    """Test the synchronizations against the fake Magento 2 server"""
+
+    def setUp(self):
+        super().setUp()
+        self.data = FakeMagentoData(websites=2, storeviews=2, products=45, orders=5)
+        self.server = FakeMagento2Server(self.data, token=self.backend.token)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.backend.location = self.server.url
+
+    def test_synchronize_metadata(self):
+        self.backend.synchronize_metadata()
+        self.assertEqual(len(self.backend.website_ids), 2)
+        storeviews = self.env["magento.storeview"].search(
+            [("backend_id", "=", self.backend.id)]
+        )
+        self.assertEqual(len(storeviews), 4)
+
+    def test_search_pages(self):
+        """The paging and the cursor walk return every product once"""
+        skus = sorted(self.data.products)
+        with self.backend.work_on("magento.product.product") as work:
+            adapter = work.component(usage="backend.adapter")
+            for cursor in (False, True):
+                pages = list(adapter.search_pages(page_size=10, cursor=cursor))
+                self.assertEqual(len(pages), 5)
+                self.assertEqual(sorted(sum(pages, [])), skus)
+            records = adapter.search_read(
+                filters={"updated_at": {"from": "2026-01-01 00:40:00"}}
+            )
+            self.assertEqual(
+                [record["sku"] for record in records], skus[39:], "filter on dates"
+            )
+
+    def test_export_inventory(self):
+        with self.backend.work_on("magento.product.product") as work:
+            adapter = work.component(usage="backend.adapter")
+            item_id = adapter.update_inventory("SKU-000003", {"qty": 12})
+            adapter.update_source_items(
+                [
+                    {
+                        "sku": "SKU-000004",
+                        "source_code": "default",
+                        "quantity": 8,
+                        "status": 1,
+                    }
+                ]
+            )
+        self.assertEqual(item_id, 3)
+        stock_item = self.data.products["SKU-000003"]["extension_attributes"][
+            "stock_item"
+        ]
+        self.assertEqual(stock_item["qty"], 12)
+        stock_item = self.data.products["SKU-000004"]["extension_attributes"][
+            "stock_item"
+        ]
+        self.assertEqual(stock_item["qty"], 8)
+
+    def test_read_attributes(self):
+        """Only the attributes asked are returned by the reads"""
+        with self.backend.work_on("magento.product.product") as work:
+            adapter = work.component(usage="backend.adapter")
+            record = adapter.read("SKU-000003", attributes=["sku", "updated_at"])
+            self.assertEqual(set(record), {"sku", "updated_at"})
+            records = adapter.search_read(attributes=["sku"])
+            self.assertEqual([set(record) for record in records], [{"sku"}] * 45)
+            records = adapter.search_read(cursor=True, page_size=10, attributes=["sku"])
+            self.assertEqual([set(record) for record in records], [{"sku", "id"}] * 45)
+
+    def test_check_freshness(self):
+        """The update dates of several records are read at once"""
+        bindings = self.env["magento.product.product"]
+        for index, xmlid in enumerate(
+            ["product_product_7", "product_product_8", "product_product_9"], 2
+        ):
+            bindings |= self.create_binding_no_export(
+                "magento.product.product",
+                self.env.ref("product.%s" % xmlid),
+                external_id="SKU-%06d" % index,
+                # product 3 is updated after, product 4 does not exist
+                sync_date="2026-01-01 00:02:30" if index < 4 else "2026-03-01",
+            )
+        self.data.products.pop("SKU-000004")
+        results = []
+        with self.backend.work_on("magento.product.product") as work:
+            exporter = work.component(usage="product.inventory.exporter")
+            exporter.check_freshness(bindings)
+            for binding in bindings:
+                exporter.binding = binding
+                exporter.external_id = binding.external_id
+                try:
+                    results.append(exporter._should_import())
+                except IDMissingInBackend:
+                    results.append(None)
+        self.assertEqual(results, [False, True, None])
+        self.assertEqual(self.server.requests, {("GET", "products"): 1})
+
+    def test_export_inventory_bulk_unauthorized(self):
+        """A bulk stock export refused for any product is not split"""
+        bindings = self.env["magento.product.product"]
+        for index, xmlid in enumerate(
+            ["product_product_7", "product_product_8", "product_product_9"], 1
+        ):
+            bindings |= self.create_binding_no_export(
+                "magento.product.product",
+                self.env.ref("product.%s" % xmlid),
+                external_id="SKU-%06d" % index,
+            )
+        self.server.error_rate = 1.0
+        self.server.error_status = 401
+        with self.backend.work_on("magento.product.product") as work:
+            exporter = work.component(usage="product.inventory.exporter")
+            with self.assertRaises(requests.HTTPError):
+                exporter.run_bulk(bindings)
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_ship_order(self):
+        item = self.data.orders[1]["items"][0]
+        with self.backend.work_on("magento.stock.picking") as work:
+            adapter = work.component(usage="backend.adapter")
+            shipment_id = adapter._call(
+                "order/1/ship",
+                {"items": [{"order_item_id": item["item_id"], "qty": 1}]},
+                http_method="post",
+            )
+        self.assertEqual(shipment_id, 1)
+        self.assertEqual(item["qty_shipped"], 1)
+
+    def test_error_injection(self):
+        self.server.error_rate = 1.0
+        with self.backend.work_on("magento.product.product") as work:
+            adapter = work.component(usage="backend.adapter")
+            with self.assertRaises(requests.HTTPError):
+                adapter.read("SKU-000001")
+        self.assertEqual(self.server.requests, {("GET", "products/SKU-000001"): 1})
+
+
+class TestExportRecords(TransactionComponentRegistryCase):
+    """Test the exports of several records against the fake server"""
+
+    def setUp(self):
+        super().setUp()
+        data = FakeMagentoData(websites=1, storeviews=1, products=10, orders=0)
+        self.server = FakeMagento2Server(data, token="odoo42")
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        warehouse = self.env.ref("stock.warehouse0")
+        self.backend = self.env["magento.backend"].create(
+            {
+                "name": "Test Magento",
+                "version": "2.0",
+                "location": self.server.url,
+                "warehouse_id": warehouse.id,
+                "token": "odoo42",
+            }
+        )
+        exported = self.exported = []
+        imported = self.imported = []
+
+        class StubProductExporter(Component):
+            """Export with the generic flow, which checks the update dates"""
+
+            _name = "stub.product.exporter"
+            _inherit = "magento.base.exporter"
+            _apply_on = "magento.product.product"
+
+            def _run(self, fields=None):
+                exported.append(self.external_id)
+
+            def _delay_import(self):
+                imported.append(self.external_id)
+
+        self._build_components(
+            components.core.BaseMagentoConnectorComponent,
+            components.backend_adapter.MagentoCRUDAdapter,
+            components.backend_adapter.GenericAdapter,
+            components.binder.MagentoModelBinder,
+            components.exporter.MagentoBaseExporter,
+            ProductProductAdapter,
+            StubProductExporter,
+        )
+
+    def test_export_records(self):
+        """The update dates are read once per chunk of exported records"""
+        bindings = self.env["magento.product.product"]
+        for index, xmlid in enumerate(
+            ["product_product_7", "product_product_8", "product_product_9"], 2
+        ):
+            bindings |= (
+                self.env["magento.product.product"]
+                .with_context(connector_no_export=True)
+                .create(
+                    {
+                        "backend_id": self.backend.id,
+                        "odoo_id": self.env.ref("product.%s" % xmlid).id,
+                        "external_id": "SKU-%06d" % index,
+                        # product 3 is updated after its last sync
+                        "sync_date": "2026-01-01" if index == 3 else "2026-03-01",
+                    }
+                )
+            )
+        backend_model = type(self.backend)
+        work_on = backend_model.work_on
+        comp_registry = self.comp_registry
+
+        def work_on_test_registry(backend, model_name, **kwargs):
+            # the sync sessions use the components built for the test
+            return work_on(
+                backend, model_name, components_registry=comp_registry, **kwargs
+            )
+
+        with mock.patch.object(
+            backend_model, "work_on", work_on_test_registry
+        ), mock.patch.object(type(bindings), "EXPORT_CHUNK_SIZE", 2):
+            bindings.export_records()
+        self.assertEqual(self.exported, ["SKU-000002", "SKU-000003", "SKU-000004"])
+        self.assertEqual(self.imported, ["SKU-000003"])
+        self.assertEqual(self.server.requests, {("GET", "products"): 2})
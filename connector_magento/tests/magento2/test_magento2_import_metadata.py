@@ -3,6 +3,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
 from .common import Magento2TestCase, recorder
+from .fake_magento import FakeMagento2Server, FakeMagentoData
 
 
 class TestImportMetadata(Magento2TestCase):
@@ -23,3 +24,21 @@ class TestImportMetadata(Magento2TestCase):
         storeview = storeview_model.search([("backend_id", "=", self.backend.id)])
         self.assertEqual(len(storeview), 1)
         self.assertEqual(storeview.base_media_url, "http://magento/media/")
+
+    def test_import_metadata_snapshot(self):
+        """Each list of metadata is fetched once per synchronization"""
+        data = FakeMagentoData(websites=3, storeviews=3)
+        server = FakeMagento2Server(data, token=self.backend.token)
+        server.start()
+        self.addCleanup(server.stop)
+        self.backend.location = server.url
+        self.backend.synchronize_metadata()
+        storeviews = self.env["magento.storeview"].search(
+            [("backend_id", "=", self.backend.id)]
+        )
+        self.assertEqual(len(storeviews), 9)
+        # the list of the records serves the search of the ids as well
+        self.assertEqual(server.requests[("GET", "store/websites")], 1)
+        self.assertEqual(server.requests[("GET", "store/storeGroups")], 1)
+        self.assertEqual(server.requests[("GET", "store/storeConfigs")], 1)
+        self.assertEqual(server.requests[("GET", "store/storeViews")], 1)
@@ -2,7 +2,11 @@
 # Copyright 2020 Opener B.V.
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
-from .common import Magento2SyncTestCase, recorder
+import re
+from datetime import datetime
+
+from .common import Magento2SyncTestCase, Magento2TestCase, recorder
+from .fake_magento import FakeMagento2Server, FakeMagentoData
 
 
 class TestImportProductCategory(Magento2SyncTestCase):
@@ -28,3 +32,93 @@ class TestImportProductCategory(Magento2SyncTestCase):
         categories = category_model.search([("backend_id", "=", backend_id)])
         # tree: Root -> Default -> Women > Bottoms > Test Magento (hidden)
         self.assertEqual(len(categories), 5)
+
+
+class TestImportProductCategoryTree(Magento2TestCase):
+    """Test the incremental sync of the tree of product categories"""
+
+    def setUp(self):
+        super().setUp()
+        self.data = FakeMagentoData(categories=20)
+        self.server = FakeMagento2Server(self.data, token=self.backend.token)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.backend.write(
+            {
+                "location": self.server.url,
+                "category_tree_sync": True,
+                "category_tree_chunk_size": 5,
+            }
+        )
+
+    def _sync(self, filters=None):
+        """Run the batch import and return the categories to import"""
+        with self.mock_with_delay() as (delayable_cls, delayable):
+            self.env["magento.product.category"].import_batch(
+                self.backend, filters=filters or {}
+            )
+        if not delayable.import_tree_nodes.called:
+            return []
+        __, external_ids = delayable.import_tree_nodes.call_args[0]
+        return external_ids
+
+    def _import(self, external_ids):
+        """Run the chained jobs importing the categories"""
+        chunks = 0
+        while external_ids:
+            chunks += 1
+            with self.mock_with_delay() as (delayable_cls, delayable):
+                self.env["magento.product.category"].import_tree_nodes(
+                    self.backend, external_ids
+                )
+            external_ids = []
+            if delayable.import_tree_nodes.called:
+                __, external_ids = delayable.import_tree_nodes.call_args[0]
+        return chunks
+
+    def _count_reads(self):
+        return sum(
+            count
+            for (method, path), count in self.server.requests.items()
+            if re.match(r"categories/\d+$", path)
+        )
+
+    def test_tree_sync(self):
+        """The categories are imported once, the parents first"""
+        external_ids = self._sync()
+        self.assertEqual(len(external_ids), 22)
+        self.assertEqual(self.server.requests[("GET", "categories")], 1)
+        seen = set()
+        for external_id in external_ids:
+            parent_id = self.data.categories[int(external_id)]["parent_id"]
+            if parent_id:
+                self.assertIn(str(parent_id), seen)
+            seen.add(external_id)
+        self.assertEqual(self._import(external_ids), 5)
+        self.assertEqual(self._count_reads(), 22)
+        bindings = self.env["magento.product.category"].search(
+            [("backend_id", "=", self.backend.id)]
+        )
+        self.assertEqual(len(bindings), 22)
+        child = bindings.filtered(lambda binding: binding.external_id == "10")
+        self.assertEqual(
+            child.magento_parent_id.external_id,
+            str(self.data.categories[10]["parent_id"]),
+        )
+
+    def test_tree_sync_changes(self):
+        """Only the moved or modified categories are imported again"""
+        self._import(self._sync())
+        filters = {"from_date": datetime(2026, 2, 1)}
+        self.assertEqual(self._sync(dict(filters)), [])
+        self.data.categories[5]["position"] = 42
+        self.data.categories[7]["updated_at"] = "2026-03-01 10:00:00"
+        external_ids = self._sync(dict(filters))
+        self.assertEqual(sorted(external_ids), ["5", "7"])
+        reads = self._count_reads()
+        self._import(external_ids)
+        self.assertEqual(self._count_reads(), reads + 2)
+        binding = self.env["magento.product.category"].search(
+            [("backend_id", "=", self.backend.id), ("external_id", "=", "5")]
+        )
+        self.assertEqual(binding.magento_position, 42)
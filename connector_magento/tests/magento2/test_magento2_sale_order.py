@@ -4,6 +4,8 @@
 
 from collections import namedtuple
 
+import mock
+
 from .common import Magento2SyncTestCase, recorder
 
 ExpectedOrderLine = namedtuple(
@@ -90,6 +92,20 @@ class TestSaleOrder(Magento2SyncTestCase):
         self.assertEqual(new_binding.magento_parent_id, binding)
         self.assertTrue(binding.canceled_in_backend)
 
+    def test_parent_orders_linked(self):
+        """The chain of parent orders already linked is read in Odoo"""
+        binding = self._import_sale_order("9")
+        new_binding = self._import_sale_order("10")
+        with self.backend.work_on("magento.sale.order") as work:
+            importer = work.component(usage="record.importer")
+            with mock.patch.object(
+                importer.backend_adapter, "get_parent", return_value=None
+            ) as get_parent:
+                self.assertEqual(importer._get_parent_bindings("10"), [new_binding])
+                get_parent.assert_not_called()
+                self.assertEqual(importer._get_parent_bindings("9"), [binding])
+                get_parent.assert_called_once_with("9")
+
     def test_import_sale_order_storeview_options(self):
         """Check if storeview options are propagated"""
         storeview = self.env["magento.storeview"].search(
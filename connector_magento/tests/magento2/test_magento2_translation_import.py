@@ -0,0 +1,187 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+import threading
+from datetime import datetime
+
+from odoo.addons.component.core import Component, WorkContext
+from odoo.addons.component.tests.common import TransactionComponentRegistryCase
+
+from ... import components
+
+LANGS = {"fr": "fr_FR", "nl": "nl_NL", "de": "de_DE"}
+
+
+class StubMagentoAPI(object):
+    """Return a product named after the storeview it is read in"""
+
+    api = None
+
+    def __init__(self, reads):
+        self.reads = reads
+
+    def call(self, method, arguments, http_method=None, storeview=None):
+        self.reads.append((storeview, threading.current_thread().name))
+        return {"name": "Hoodie %s" % storeview}
+
+
+class TestTranslationImport(TransactionComponentRegistryCase):
+    """Test the import of the translations of the storeviews"""
+
+    def setUp(self):
+        super().setUp()
+        warehouse = self.env.ref("stock.warehouse0")
+        self.backend = self.env["magento.backend"].create(
+            {
+                "name": "Test Magento",
+                "version": "2.0",
+                "location": "http://magento",
+                "warehouse_id": warehouse.id,
+                "token": "odoo42",
+            }
+        )
+        website = self.env["magento.website"].create(
+            {"name": "Main Website", "backend_id": self.backend.id}
+        )
+        self.store = self.env["magento.store"].create(
+            {
+                "name": "Main Store",
+                "website_id": website.id,
+                "backend_id": self.backend.id,
+            }
+        )
+        self.storeviews = self.env["magento.storeview"]
+        for code, lang_code in LANGS.items():
+            self.env["res.lang"]._activate_lang(lang_code)
+            self.storeviews |= self.env["magento.storeview"].create(
+                {
+                    "name": code,
+                    "code": code,
+                    "store_id": self.store.id,
+                    "lang_id": self.env["res.lang"]._lang_get(lang_code).id,
+                }
+            )
+        self.binding = self.env["magento.product.product"].create(
+            {
+                "odoo_id": self.env.ref("product.product_product_7").id,
+                "backend_id": self.backend.id,
+                "external_id": "MH09-L-Blue",
+            }
+        )
+        self.reads = []
+        results = self.results = []
+
+        class StubProductAdapter(Component):
+            _name = "stub.product.adapter"
+            _collection = "magento.backend"
+            _usage = "backend.adapter"
+            _apply_on = "magento.product.product"
+            _magento2_key = "sku"
+
+            def read(self, external_id, storeview_id=None, attributes=None):
+                resource, params = self._read_request(external_id, attributes)
+                return self._read_result(
+                    self.work.magento_api.call(resource, params, storeview=storeview_id)
+                )
+
+            def _read_request(self, external_id, attributes=None):
+                return "products/%s" % external_id, None
+
+            def _read_result(self, record):
+                results.append(threading.current_thread().name)
+                return record
+
+        class StubMapRecord(object):
+            def __init__(self, record):
+                self.record = record
+
+            def values(self, **kwargs):
+                return {"name": self.record["name"]}
+
+        class StubProductMapper(Component):
+            _name = "stub.product.mapper"
+            _collection = "magento.backend"
+            _usage = "import.mapper"
+            _apply_on = "magento.product.product"
+
+            def map_record(self, record, parent=None):
+                return StubMapRecord(record)
+
+        self._build_components(
+            StubProductAdapter,
+            StubProductMapper,
+            components.core.BaseMagentoConnectorComponent,
+            components.importer.MagentoImporter,
+            components.importer.TranslationImporter,
+        )
+        self.work = WorkContext(
+            model_name="magento.product.product",
+            collection=self.backend,
+            components_registry=self.comp_registry,
+            magento_api=StubMagentoAPI(self.reads),
+        )
+
+    def _run(self, **kwargs):
+        importer = self.work.component(usage="translation.importer")
+        importer.run("MH09-L-Blue", self.binding, **kwargs)
+
+    def test_translations_parallel(self):
+        """The storeviews are read concurrently"""
+        self.backend.import_translation_workers = 3
+        self._run()
+        self.assertEqual(sorted(code for code, __ in self.reads), ["de", "fr", "nl"])
+        self.assertNotIn(threading.current_thread().name, {t for __, t in self.reads})
+        # the records are adapted in the job thread
+        self.assertEqual(set(self.results), {threading.current_thread().name})
+        for code, lang_code in LANGS.items():
+            self.assertEqual(
+                self.binding.with_context(lang=lang_code).name, "Hoodie %s" % code
+            )
+
+    def test_translations_sequential(self):
+        """With a single worker, the storeviews are read in the job thread"""
+        self.backend.import_translation_workers = 1
+        self._run()
+        self.assertEqual({t for __, t in self.reads}, {threading.current_thread().name})
+        self.assertEqual(self.binding.with_context(lang="nl_NL").name, "Hoodie nl")
+
+    def test_skip_unchanged_translations(self):
+        """The storeviews are not read when the record is unchanged"""
+        self.backend.skip_unchanged_translations = True
+        self._run(
+            magento_record={"updated_at": "2026-01-01 10:00:00"},
+            last_sync_date=datetime(2026, 1, 2),
+        )
+        self.assertFalse(self.reads)
+        self._run(
+            magento_record={"updated_at": "2026-01-03 10:00:00"},
+            last_sync_date=datetime(2026, 1, 2),
+        )
+        self.assertEqual(len(self.reads), 3)
+
+    def test_translation_storeviews_cache(self):
+        """The storeviews of the languages are cached until modified"""
+        storeview_model = self.env["magento.storeview"]
+        self.assertEqual(
+            storeview_model._get_translation_storeview_ids(self.backend.id, False),
+            tuple(self.storeviews.ids),
+        )
+        german = self.storeviews.filtered(lambda storeview: storeview.code == "de")
+        german.lang_id = False
+        self.assertEqual(
+            storeview_model._get_translation_storeview_ids(self.backend.id, False),
+            tuple((self.storeviews - german).ids),
+        )
+        dutch = self.storeviews.filtered(lambda storeview: storeview.code == "nl")
+        self.assertEqual(
+            storeview_model._get_translation_storeview_ids(
+                self.backend.id, dutch.lang_id.id
+            ),
+            tuple((self.storeviews - german - dutch).ids),
+        )
+
+    def test_translatable_fields(self):
+        """The translatable fields of the model are listed"""
+        fields = self.env["magento.product.product"]._get_translatable_fields()
+        self.assertIn("name", fields)
+        self.assertNotIn("default_code", fields)
@@ -0,0 +1,98 @@
+# Copyright 2026 Azerty B.V.
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
+
+import mock
+
+from .common import MagentoTestCase
+
+
+class TestBinderCache(MagentoTestCase):
+    """Test the bindings cached by the binders during a sync session"""
+
+    def setUp(self):
+        super().setUp()
+        self.binding_blue = self.create_binding_no_export(
+            "magento.product.product",
+            self.env.ref("product.product_product_7"),
+            external_id="101",
+        )
+        self.binding_green = self.create_binding_no_export(
+            "magento.product.product",
+            self.env.ref("product.product_product_8"),
+            external_id="102",
+        )
+
+    def test_to_internal_cached(self):
+        """The bindings found are kept in the cache of the session"""
+        with self.backend.work_on("magento.product.product") as work:
+            binder = work.component(usage="binder")
+            self.assertEqual(binder.to_internal(101), self.binding_blue)
+            self.assertEqual(
+                work.magento_binding_cache,
+                {
+                    (
+                        "magento.product.product",
+                        self.backend.id,
+                        "101",
+                    ): self.binding_blue.id
+                },
+            )
+            self.assertEqual(
+                binder.to_internal("101", unwrap=True),
+                self.env.ref("product.product_product_7"),
+            )
+            self.assertFalse(binder.to_internal("999"))
+            self.assertEqual(len(work.magento_binding_cache), 1)
+
+    def test_cache_shared_by_session(self):
+        """The cache is shared by the binders of the session only"""
+        with self.backend.work_on("magento.sale.order") as work:
+            binder = work.component(
+                usage="binder", model_name="magento.product.product"
+            )
+            binder.to_internal("101")
+            cache = work.magento_binding_cache
+            other = work.component(usage="binder", model_name="magento.product.product")
+            self.assertIs(other.work.magento_binding_cache, cache)
+        with self.backend.work_on("magento.product.product") as work:
+            self.assertEqual(work.magento_binding_cache, {})
+
+    def test_to_internal_many(self):
+        """The bindings are searched at once"""
+        with self.backend.work_on("magento.product.product") as work:
+            binder = work.component(usage="binder")
+            result = binder.to_internal_many(["101", "102", "999"])
+            self.assertEqual(
+                result, {"101": self.binding_blue, "102": self.binding_green}
+            )
+            self.assertEqual(len(work.magento_binding_cache), 2)
+            result = binder.to_internal_many(["102"], unwrap=True)
+            self.assertEqual(result, {"102": self.env.ref("product.product_product_8")})
+
+    def test_bind_updates_cache(self):
+        """Binding again a record replaces its external ID in the cache"""
+        with self.backend.work_on("magento.product.product") as work:
+            binder = work.component(usage="binder")
+            binder.to_internal("101")
+            binder.bind("201", self.binding_blue)
+            self.assertFalse(binder.to_internal("101"))
+            self.assertEqual(binder.to_internal("201"), self.binding_blue)
+
+    def test_import_dependencies_many(self):
+        """Only the missing dependencies are imported"""
+        with self.backend.work_on("magento.sale.order") as work:
+            importer = work.component(usage="record.importer")
+            dependency_importer = mock.Mock(name="importer")
+            component = importer.component
+
+            def get_component(usage=None, model_name=None, **kw):
+                if usage == "record.importer":
+                    return dependency_importer
+                return component(usage=usage, model_name=model_name, **kw)
+
+            with mock.patch.object(importer, "component", side_effect=get_component):
+                importer._import_dependencies_many(
+                    ["101", "103", "102", "103", None], "magento.product.product"
+                )
+            dependency_importer.run.assert_called_once_with("103")
+            self.assertEqual(len(work.magento_binding_cache), 2)
@@ -1,8 +1,10 @@
 # Copyright 2015-2019 Camptocamp SA
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html)
 
+import hashlib
 import urllib.error
 from base64 import b64encode
+from contextlib import contextmanager
 
 import mock
 
@@ -29,6 +31,7 @@ PNG_IMG_4PX_GREEN = (
     "\x00\x00IEND\xaeB`\x82".encode("utf-8")
 )
 B64_PNG_IMG_4PX_GREEN = b64encode(PNG_IMG_4PX_GREEN)
+SHA1_PNG_IMG_4PX_GREEN = hashlib.sha1(PNG_IMG_4PX_GREEN).hexdigest()
 
 
 class TestImportProductImage(TransactionComponentRegistryCase):
@@ -125,6 +128,15 @@ class TestImportProductImage(TransactionComponentRegistryCase):
             self.env[model_name].with_context(connector_no_export=True).create(values)
         )
 
+    @contextmanager
+    def mock_session(self):
+        """Mock the ``get`` method of the session downloading the images"""
+        session = mock.Mock(name="session")
+        with mock.patch.object(
+            self.image_importer, "_get_session", return_value=session
+        ):
+            yield session.get
+
     def test_image_priority(self):
         """Check if the images are sorted in the correct priority"""
         file1 = {"file": "file1", "types": ["image"], "position": "10"}
@@ -152,7 +164,7 @@ class TestImportProductImage(TransactionComponentRegistryCase):
         binding_no_export = mock.MagicMock(name="magento.product.product,999:no_export")
         binding.with_context.return_value = binding_no_export
 
-        with mock.patch("requests.get") as requests_get:
+        with self.mock_session() as requests_get:
 
             def image_url_response(url, headers=None, verify=None):
                 if url in (url_tee1, url_tee2):
@@ -166,7 +178,12 @@ class TestImportProductImage(TransactionComponentRegistryCase):
 
         binding.with_context.assert_called_with(connector_no_export=True)
         binding_no_export.write.assert_called_with(
-            {"image_1920": B64_PNG_IMG_4PX_GREEN}
+            {
+                "image_1920": B64_PNG_IMG_4PX_GREEN,
+                "magento_image_file": "/m/a/connector_magento_1.png",
+                "magento_image_checksum": SHA1_PNG_IMG_4PX_GREEN,
+                "magento_image_etag": None,
+            }
         )
 
     def test_import_images_403(self):
@@ -183,7 +200,7 @@ class TestImportProductImage(TransactionComponentRegistryCase):
             "http://localhost:9100/media/catalog/product/"
             "i/n/ink-eater-krylon-bombear-destroyed-tee-2.jpg"
         )
-        with mock.patch("requests.get") as requests_get:
+        with self.mock_session() as requests_get:
 
             def image_url_response(url, headers=None, verify=None):
                 if url == url_tee2:
@@ -195,3 +212,39 @@ class TestImportProductImage(TransactionComponentRegistryCase):
             requests_get.side_effect = image_url_response
             with self.assertRaises(urllib.error.HTTPError):
                 self.image_importer.run(122, binding)
+
+    def test_import_images_not_modified(self):
+        """The image is not downloaded again when its ETag is unchanged"""
+        binding = mock.Mock(name="magento.product.product,999")
+        binding.magento_image_file = "/m/a/connector_magento_1.png"
+        binding.magento_image_etag = '"42"'
+        with self.mock_session() as requests_get:
+
+            def image_url_response(url, headers=None, verify=None):
+                if "connector_magento_1.png" in url:
+                    self.assertEqual(headers["If-None-Match"], '"42"')
+                    return MockResponseImage("", code=304)
+                return MockResponseImage(PNG_IMG_4PX_GREEN)
+
+            requests_get.side_effect = image_url_response
+            self.image_importer.run(111, binding)
+        binding.with_context.assert_not_called()
+
+    def test_import_images_same_checksum(self):
+        """An image with the same checksum is not written again"""
+        binding = mock.Mock(name="magento.product.product,999")
+        binding_no_export = mock.Mock(name="magento.product.product,999:no_export")
+        binding_no_export.magento_image_checksum = SHA1_PNG_IMG_4PX_GREEN
+        binding.with_context.return_value = binding_no_export
+        with self.mock_session() as requests_get:
+            response = MockResponseImage(PNG_IMG_4PX_GREEN)
+            response.headers["ETag"] = '"43"'
+            requests_get.return_value = response
+            self.image_importer.run(111, binding)
+        binding_no_export.write.assert_called_once_with(
+            {
+                "magento_image_file": "/m/a/connector_magento_1.png",
+                "magento_image_checksum": SHA1_PNG_IMG_4PX_GREEN,
+                "magento_image_etag": '"43"',
+            }
+        )